@@ -5,13 +5,17 @@ A Model Context Protocol server for interacting with Azure DevOps,
 focusing on variable groups and service connections.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .config import Config
-from .models import ServiceConnection, VariableGroup
-from .server import MCPAzureDevOpsServer
+if TYPE_CHECKING:
+    from .config import Config
+    from .models import ServiceConnection, VariableGroup
+    from .server import MCPAzureDevOpsServer
 
 __all__ = [
     "MCPAzureDevOpsServer",
@@ -19,3 +23,23 @@ __all__ = [
     "VariableGroup",
     "ServiceConnection",
 ]
+
+# Public names are resolved on first access (PEP 562) so that importing a
+# submodule does not pull in the whole MCP/httpx stack via the server module.
+_LAZY_IMPORTS = {
+    "MCPAzureDevOpsServer": ".server",
+    "Config": ".config",
+    "VariableGroup": ".models",
+    "ServiceConnection": ".models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import public package attributes."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,139 @@
+"""
+In-process caching for MCP Azure DevOps Server.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its freshness deadlines (monotonic clock)."""
+
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class TTLCache:
+    """Async TTL cache with stale-while-revalidate semantics.
+
+    Fresh entries are returned as-is. Stale entries are returned immediately while
+    a background task refreshes them. Misses (and expired entries) await the loader,
+    with concurrent callers for the same key sharing a single load.
+    """
+
+    def __init__(self, ttl: float, stale: Optional[float] = None, maxsize: int = 1024):
+        self.ttl = ttl
+        self.stale = 3 * ttl if stale is None else stale
+        self.maxsize = maxsize
+        self._entries: Dict[str, CacheEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshes: Dict[str, "asyncio.Task[None]"] = {}
+        # Bumped when a key is invalidated mid-load, so that load's result is not stored
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def fetch(self, key: str, loader: Loader) -> Any:
+        """Return the cached value for key, loading or refreshing it as needed."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.fresh_until:
+                return entry.value
+            if now < entry.stale_until:
+                self._schedule_refresh(key, loader)
+                return entry.value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another caller may have loaded the value while we were waiting
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() < entry.fresh_until:
+                    return entry.value
+
+                generation = self._generations.get(key, 0)
+                value = await loader()
+                if self._generations.get(key, 0) == generation:
+                    self._store(key, value)
+                return value
+        finally:
+            # A failed or invalidated load stores nothing, so no _discard would clean up
+            if key not in self._entries:
+                self._forget(key)
+
+    def invalidate(self, prefix: str = "") -> int:
+        """Drop every entry whose key starts with prefix. Returns the number removed.
+
+        Refreshes in flight for those keys are cancelled, and loads already running
+        are not stored, so a value read before the invalidation cannot come back.
+        """
+        for key in [key for key in self._refreshes if key.startswith(prefix)]:
+            self._refreshes.pop(key).cancel()
+        for key, lock in self._locks.items():
+            if lock.locked() and key.startswith(prefix):
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def cancel_refreshes(self) -> None:
+        """Cancel any background refreshes still in flight."""
+        for task in list(self._refreshes.values()):
+            task.cancel()
+        self._refreshes.clear()
+
+    def _store(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        # Re-insert so dict order tracks recency of writes for eviction
+        self._entries.pop(key, None)
+        self._entries[key] = CacheEntry(
+            value=value, fresh_until=now + self.ttl, stale_until=now + self.ttl + self.stale
+        )
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        # Keep the bookkeeping of a load still in flight; it checks its generation
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._locks[key]
+            self._generations.pop(key, None)
+
+    def _schedule_refresh(self, key: str, loader: Loader) -> None:
+        if key in self._refreshes:
+            return
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._refreshes[key] = task
+
+    async def _refresh(self, key: str, loader: Loader) -> None:
+        generation = self._generations.get(key, 0)
+        try:
+            value = await loader()
+            if self._generations.get(key, 0) == generation:
+                self._store(key, value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Keep serving the stale value; the next miss will surface the error
+            logger.debug("Background refresh failed for %s: %s", key, e)
+        finally:
+            # An invalidated refresh may already have been replaced by a newer one
+            if self._refreshes.get(key) is asyncio.current_task():
+                del self._refreshes[key]
@@ -3,14 +3,14 @@ Azure DevOps API client for MCP server.
 """
 
 import asyncio
-import base64
-import json
 import logging
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+import random
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import httpx
+import orjson
 
+from .cache import TTLCache
 from .config import Config
 from .models import Project, ServiceConnection, VariableGroup
 from .security import SecurityFilter, create_correlation_id, get_secure_logger
@@ -18,10 +18,68 @@ from .security import SecurityFilter, create_correlation_id, get_secure_logger
 logger = logging.getLogger(__name__)
 secure_logger = get_secure_logger(__name__)
 
+T = TypeVar("T")
+
+# Connection pool limits shared by every client instance. Keeping more than one
+# connection alive spreads HTTP/2 streams so a single connection's flow-control
+# window does not become the bottleneck.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
+
+# Upper bound on concurrent requests issued by the bulk fetch helpers
+BULK_CONCURRENCY = 10
+
+# What request logging shows for headers; the real Authorization value is never logged
+LOGGED_REQUEST_HEADERS = {
+    "Authorization": SecurityFilter.REDACTED,
+    "Content-Type": "application/json",
+}
+
+# Endpoint paths, relative to the organization or project API URL
+PROJECTS_PATH = "/projects"
+VG_PATH = "/distributedtask/variablegroups"
+SC_PATH = "/serviceendpoint/endpoints"
+
+# List endpoints are read in pages of this size, following the continuation token
+PAGE_SIZE = 200
+CONTINUATION_TOKEN_HEADER = "x-ms-continuationtoken"
+
+# Transient responses worth retrying, and the backoff schedule (seconds)
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+# Methods safe to replay after a dropped connection or gateway error. Other requests
+# may already have taken effect, so they are only retried when they cannot have
+# reached Azure DevOps: failed connects and 429 responses.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+RETRY_BACKOFF_BASE = 0.3
+RETRY_BACKOFF_CAP = 10.0
+RETRY_AFTER_MAX = 60.0
+
+# Response bodies are read incrementally in chunks of this size
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# List responses longer than this are turned into models in a worker thread
+PARSE_IN_THREAD_THRESHOLD = 64
+
+
+def _item_url(collection_url: str, item_id: Any) -> str:
+    """URL of a single item in a collection."""
+    return f"{collection_url}/{item_id}"
+
+
+async def _build_models(
+    factory: Callable[[Dict[str, Any]], T], values: List[Dict[str, Any]]
+) -> List[T]:
+    """Build models from API items, off the event loop for large responses."""
+    if len(values) > PARSE_IN_THREAD_THRESHOLD:
+        return await asyncio.to_thread(lambda: [factory(value) for value in values])
+    return [factory(value) for value in values]
+
 
 class AzureDevOpsAPIError(Exception):
     """Exception raised for Azure DevOps API errors."""
 
+    __slots__ = ("status_code", "response_data")
+
     def __init__(
         self,
         message: str,
@@ -36,52 +94,68 @@ class AzureDevOpsAPIError(Exception):
 class AzureDevOpsClient:
     """Client for interacting with Azure DevOps REST API."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Create a client.
+
+        Args:
+            config: Server configuration
+            transport: httpx transport to send requests through instead of the network,
+                e.g. httpx.MockTransport in tests
+        """
         self.config = config
-        self._client: Optional[httpx.AsyncClient] = None
+        self._transport = transport
         self._auth_header = self._create_auth_header()
+        # Built once and reused every time the HTTP client is (re)created
+        self._default_headers = {
+            "Authorization": self._auth_header,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        self._timeout = httpx.Timeout(config.request_timeout)
+        self._base_params = {"api-version": config.api_version}
+        self._cache: Optional[TTLCache] = (
+            TTLCache(ttl=config.cache_ttl_seconds)
+            if config.enable_caching and config.cache_ttl_seconds > 0
+            else None
+        )
+        self._bulk_semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+        # Creating the client opens no connections, so it is safe to do eagerly
+        self._client: Optional[httpx.AsyncClient] = self._build_client()
 
     def _create_auth_header(self) -> str:
         """Create the authorization header value."""
-        # Azure DevOps uses basic auth with empty username and PAT as password
-        credentials = f":{self.config.personal_access_token}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded_credentials}"
+        return f"Basic {self.config.auth_header}"
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Build the underlying HTTP client.
+
+        HTTP/2 lets concurrent tool calls multiplex over a single TLS connection
+        to dev.azure.com instead of each waiting for a pooled HTTP/1.1 socket.
+        """
+        return httpx.AsyncClient(
+            timeout=self._timeout,
+            headers=self._default_headers,
+            http2=True,
+            limits=HTTP_LIMITS,
+            transport=self._transport,
+        )
 
     async def __aenter__(self) -> "AzureDevOpsClient":
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self.config.request_timeout),
-            headers={
-                "Authorization": self._auth_header,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-        )
         return self
 
     async def close(self) -> None:
         """Close the HTTP client."""
-        if self._client:
+        if self._cache is not None:
+            self._cache.cancel_refreshes()
+        if self._client is not None and not self._client.is_closed:
             await self._client.aclose()
-            self._client = None
+        self._client = None
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """Async context manager exit."""
         await self.close()
 
-    async def _ensure_client_initialized(self) -> None:
-        """Ensure the HTTP client is initialized."""
-        if not self._client:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.config.request_timeout),
-                headers={
-                    "Authorization": self._auth_header,
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                },
-            )
-
     async def _make_request(
         self,
         method: str,
@@ -90,45 +164,83 @@ class AzureDevOpsClient:
         json_data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Make an HTTP request to Azure DevOps API."""
+        data, _ = await self._request(method, url, params, json_data)
+        return data
+
+    async def _make_paged_request(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """GET one page of a list endpoint, returning it with the continuation token."""
+        return await self._request("GET", url, params)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Make a request, serving GETs from the cache when it is enabled."""
+        # Every request carries api-version; the caller's dict is never mutated
+        merged_params = {**self._base_params, **params} if params else self._base_params
+
+        if method == "GET" and self._cache is not None:
+            # Key on the full URL so different filters are cached separately
+            key = str(httpx.URL(url, params=merged_params))
+            return await self._cache.fetch(
+                key, lambda: self._send(method, url, merged_params, json_data)
+            )
+
+        return await self._send(method, url, merged_params, json_data)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Send a single HTTP request, bypassing the cache.
+
+        Returns the decoded body and the continuation token header, if any.
+        """
         # Create correlation ID for request tracing
         correlation_id = create_correlation_id()
 
-        # Auto-initialize client if needed
-        await self._ensure_client_initialized()
-
-        # Add API version to parameters
-        if params is None:
-            params = {}
-        params["api-version"] = self.config.api_version
-
-        # Log request with security filtering
-        secure_logger.debug_request(
-            method=method,
-            url=url,
-            params=params,
-            headers={"Authorization": "[REDACTED]", "Content-Type": "application/json"},
-            json_data=json_data,
-            correlation_id=correlation_id,
-        )
+        # Log request with security filtering; skip building the payload unless emitted
+        debug = secure_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            secure_logger.debug_request(
+                method=method,
+                url=url,
+                params=params,
+                headers=LOGGED_REQUEST_HEADERS,
+                json_data=json_data,
+                correlation_id=correlation_id,
+            )
 
         try:
-            assert self._client is not None  # Type guard after initialization
-            response = await self._client.request(
-                method=method, url=url, params=params, json=json_data
-            )
+            # Content-Type is already set in the default headers
+            content = orjson.dumps(json_data) if json_data is not None else None
+            response = await self._request_with_retry(method, url, params, content)
+            try:
+                body = await self._read_body(response)
+            finally:
+                await response.aclose()
 
             # Log response with security context
-            secure_logger.debug_response(
-                status_code=response.status_code,
-                response_size=len(response.content),
-                correlation_id=correlation_id,
-            )
+            if debug:
+                secure_logger.debug_response(
+                    status_code=response.status_code,
+                    response_size=len(body),
+                    correlation_id=correlation_id,
+                )
 
             if response.status_code >= 400:
                 error_data = None
                 try:
-                    error_data = response.json()
-                except json.JSONDecodeError:
+                    error_data = orjson.loads(body)
+                except orjson.JSONDecodeError:
                     pass
 
                 # Log security event for authentication failures
@@ -152,12 +264,13 @@ class AzureDevOpsClient:
                     )
 
                 raise AzureDevOpsAPIError(
-                    f"API request failed with status {response.status_code}: {response.text}",
+                    f"API request failed with status {response.status_code}: "
+                    f"{body.decode(errors='replace')}",
                     status_code=response.status_code,
                     response_data=error_data,
                 )
 
-            return response.json()
+            return orjson.loads(body), response.headers.get(CONTINUATION_TOKEN_HEADER)
 
         except httpx.RequestError as e:
             secure_logger.error_with_context(
@@ -169,21 +282,155 @@ class AzureDevOpsClient:
             )
             raise AzureDevOpsAPIError(f"Request failed: {str(e)}")
 
+    async def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        content: Optional[bytes],
+    ) -> httpx.Response:
+        """Send the request, retrying transport errors and transient statuses.
+
+        The returned response is streamed; the caller must read and close it.
+        """
+        client = self._client
+        if client is None:
+            # Used again after close(); rebuild the pool
+            client = self._client = self._build_client()
+        max_retries = self.config.max_retries
+        idempotent = method in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            try:
+                request = client.build_request(
+                    method=method, url=url, params=params, content=content
+                )
+                response = await client.send(request, stream=True)
+            except httpx.TransportError as e:
+                if attempt >= max_retries or not (idempotent or isinstance(e, UNSENT_ERRORS)):
+                    raise
+                delay = self._retry_delay(attempt)
+                reason = type(e).__name__
+            else:
+                status = response.status_code
+                retryable = status in RETRY_STATUS_CODES and (idempotent or status == 429)
+                if not retryable or attempt >= max_retries:
+                    return response
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                reason = f"status {response.status_code}"
+                await response.aclose()
+
+            logger.warning(
+                "Retrying %s %s after %s in %.2fs (attempt %d of %d)",
+                method,
+                SecurityFilter.filter_url_params(url),
+                reason,
+                delay,
+                attempt + 1,
+                max_retries,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _read_body(self, response: httpx.Response) -> bytes:
+        """Read a streamed response body, refusing anything over max_response_bytes."""
+        limit = self.config.max_response_bytes
+
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            raise self._too_large(limit)
+
+        chunks = []
+        total = 0
+        async for chunk in response.aiter_bytes(RESPONSE_CHUNK_SIZE):
+            total += len(chunk)
+            if total > limit:
+                raise self._too_large(limit)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _too_large(limit: int) -> AzureDevOpsAPIError:
+        # No status code: the response itself was usually a 200, and callers that
+        # branch on status_code must not mistake this for a successful request
+        return AzureDevOpsAPIError(f"Response exceeded the {limit} byte limit")
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with jitter, deferring to Retry-After when it is longer."""
+        delay = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2**attempt)
+        delay += random.uniform(0, RETRY_BACKOFF_BASE)
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), RETRY_AFTER_MAX))
+            except ValueError:
+                pass  # HTTP-date form; fall back to the computed backoff
+        return delay
+
+    def invalidate_cache(self, url_prefix: str = "") -> int:
+        """Drop cached GET responses whose URL starts with url_prefix."""
+        if self._cache is None:
+            return 0
+        return self._cache.invalidate(url_prefix)
+
+    def invalidate_project(self, project_id_or_name: str) -> int:
+        """Drop the cached lookup for a project, e.g. after a request under it 404s."""
+        return self._invalidate_item(self.config.api_url + PROJECTS_PATH, project_id_or_name)
+
+    def invalidate_variable_group(self, project: str, group_id: int) -> int:
+        """Drop the cached details of a variable group, e.g. after it has been edited."""
+        return self._invalidate_item(self.config.project_api_url(project) + VG_PATH, group_id)
+
+    def invalidate_service_connection(self, project: str, connection_id: str) -> int:
+        """Drop the cached details of a service connection, e.g. after it has been edited."""
+        return self._invalidate_item(self.config.project_api_url(project) + SC_PATH, connection_id)
+
+    def _invalidate_item(self, collection_url: str, item_id: Any) -> int:
+        url = _item_url(collection_url, item_id)
+        # Cache keys carry the query string; the "?" keeps "vg/1" from matching "vg/10"
+        return self.invalidate_cache(f"{httpx.URL(url)}?")
+
+    async def _get_many(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """GET several URLs concurrently, mapping 404 responses to None."""
+
+        async def get_one(url: str) -> Dict[str, Any]:
+            async with self._bulk_semaphore:
+                return await self._make_request("GET", url)
+
+        results = await asyncio.gather(*(get_one(url) for url in urls), return_exceptions=True)
+
+        responses: List[Optional[Dict[str, Any]]] = []
+        for result in results:
+            if isinstance(result, AzureDevOpsAPIError) and result.status_code == 404:
+                responses.append(None)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                responses.append(result)
+        return responses
+
+    async def _iter_pages(
+        self, url: str, params: Dict[str, Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the "value" list of each page until no continuation token is returned."""
+        while True:
+            response, token = await self._make_paged_request(url, params)
+            yield response.get("value", [])
+            if not token:
+                return
+            params = {**params, "continuationToken": token}
+
     async def get_projects(self) -> List[Project]:
         """Get all projects in the organization."""
-        url = f"{self.config.api_url}/projects"
+        url = self.config.api_url + PROJECTS_PATH
 
         response = await self._make_request("GET", url)
-        projects = []
-
-        for project_data in response.get("value", []):
-            projects.append(Project.from_api_response(project_data))
-
-        return projects
+        return await _build_models(Project.from_api_response, response.get("value", []))
 
     async def get_project(self, project_id_or_name: str) -> Optional[Project]:
         """Get a specific project by ID or name."""
-        url = f"{self.config.api_url}/projects/{project_id_or_name}"
+        url = _item_url(self.config.api_url + PROJECTS_PATH, project_id_or_name)
 
         try:
             response = await self._make_request("GET", url)
@@ -197,25 +444,27 @@ class AzureDevOpsClient:
         self, project: str, group_name: Optional[str] = None
     ) -> List[VariableGroup]:
         """Get variable groups for a project."""
+        return [vg async for vg in self.iter_variable_groups(project, group_name)]
+
+    async def iter_variable_groups(
+        self, project: str, group_name: Optional[str] = None, page_size: int = PAGE_SIZE
+    ) -> AsyncIterator[VariableGroup]:
+        """Yield variable groups for a project, one page at a time."""
         # Use project-specific API URL for variable groups
-        url = f"{self.config.project_api_url(project)}/distributedtask/variablegroups"
+        url = self.config.project_api_url(project) + VG_PATH
 
-        params = {}
+        params: Dict[str, Any] = {"$top": page_size}
         if group_name:
             params["groupName"] = group_name
 
-        response = await self._make_request("GET", url, params=params)
-        variable_groups = []
-
-        for vg_data in response.get("value", []):
-            variable_groups.append(VariableGroup.from_api_response(vg_data))
-
-        return variable_groups
+        async for vg_data in self._iter_pages(url, params):
+            for vg in await _build_models(VariableGroup.from_api_response, vg_data):
+                yield vg
 
     async def get_variable_group(self, project: str, group_id: int) -> Optional[VariableGroup]:
         """Get a specific variable group by ID."""
         # Use project-specific API URL for variable group details
-        url = f"{self.config.project_api_url(project)}/distributedtask/variablegroups/{group_id}"
+        url = _item_url(self.config.project_api_url(project) + VG_PATH, group_id)
 
         try:
             response = await self._make_request("GET", url)
@@ -225,34 +474,51 @@ class AzureDevOpsClient:
                 return None
             raise
 
+    async def get_variable_groups_bulk(
+        self, project: str, group_ids: List[int]
+    ) -> List[Optional[VariableGroup]]:
+        """Get several variable groups by ID concurrently, in the order requested."""
+        base_url = self.config.project_api_url(project) + VG_PATH
+        responses = await self._get_many([_item_url(base_url, group_id) for group_id in group_ids])
+        return [VariableGroup.from_api_response(r) if r is not None else None for r in responses]
+
     async def get_service_connections(
         self, project: str, connection_type: Optional[str] = None, include_shared: bool = True
     ) -> List[ServiceConnection]:
         """Get service connections for a project."""
+        return [
+            sc
+            async for sc in self.iter_service_connections(project, connection_type, include_shared)
+        ]
+
+    async def iter_service_connections(
+        self,
+        project: str,
+        connection_type: Optional[str] = None,
+        include_shared: bool = True,
+        page_size: int = PAGE_SIZE,
+    ) -> AsyncIterator[ServiceConnection]:
+        """Yield service connections for a project, one page at a time."""
         # Use project-specific API URL for service connections
-        url = f"{self.config.project_api_url(project)}/serviceendpoint/endpoints"
+        url = self.config.project_api_url(project) + SC_PATH
 
-        params = {}
+        params: Dict[str, Any] = {"$top": page_size}
         if connection_type:
             params["type"] = connection_type
         if include_shared:
             params["includeShared"] = "true"
 
-        response = await self._make_request("GET", url, params=params)
-        service_connections = []
-
-        for sc_data in response.get("value", []):
-            service_connections.append(ServiceConnection.from_api_response(sc_data))
-
-        return service_connections
+        async for sc_data in self._iter_pages(url, params):
+            for sc in await _build_models(ServiceConnection.from_api_response, sc_data):
+                yield sc
 
     async def get_service_connection(
         self, project: str, connection_id: str
     ) -> Optional[ServiceConnection]:
         """Get a specific service connection by ID."""
         # Use project-specific API URL for service connection details
-        url = f"{self.config.project_api_url(project)}/serviceendpoint/endpoints/{connection_id}"
-        logger.info(f"Fetching service connection from URL: {url}")
+        url = _item_url(self.config.project_api_url(project) + SC_PATH, connection_id)
+        logger.info("Fetching service connection from URL: %s", url)
         try:
             response = await self._make_request("GET", url)
             return ServiceConnection.from_api_response(response)
@@ -261,15 +527,29 @@ class AzureDevOpsClient:
                 return None
             raise
 
+    async def get_service_connections_bulk(
+        self, project: str, connection_ids: List[str]
+    ) -> List[Optional[ServiceConnection]]:
+        """Get several service connections by ID concurrently, in the order requested."""
+        base_url = self.config.project_api_url(project) + SC_PATH
+        responses = await self._get_many(
+            [_item_url(base_url, conn_id) for conn_id in connection_ids]
+        )
+        return [
+            ServiceConnection.from_api_response(r) if r is not None else None for r in responses
+        ]
+
     async def test_connection(self) -> bool:
         """Test the connection to Azure DevOps."""
         correlation_id = create_correlation_id()
         try:
-            projects = await self.get_projects()
+            # Cheapest authenticated probe: at most one project, never served from cache
+            await self._send(
+                "GET", self.config.api_url + PROJECTS_PATH, {**self._base_params, "$top": 1}
+            )
             secure_logger.info_with_context(
-                message=f"Successfully connected to Azure DevOps. Found {len(projects)} projects.",
+                message="Successfully connected to Azure DevOps.",
                 correlation_id=correlation_id,
-                project_count=len(projects),
             )
             return True
         except Exception as e:
@@ -2,17 +2,62 @@
 Configuration management for MCP Azure DevOps Server.
 """
 
+import base64
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
 from dotenv import load_dotenv  # type: ignore
 
-# Load environment variables from .env file
-load_dotenv()
 
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    """Load environment variables from the .env file, at most once per process."""
+    load_dotenv()
 
-@dataclass
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+# Optional settings: (field name, environment variable, parser). Unset variables
+# fall back to the dataclass defaults.
+_ENV_FIELDS: Tuple[Tuple[str, str, Callable[[str], Any]], ...] = (
+    ("api_version", "API_VERSION", str),
+    ("log_level", "LOG_LEVEL", str),
+    ("log_format", "LOG_FORMAT", str),
+    ("request_timeout", "REQUEST_TIMEOUT", int),
+    ("max_retries", "MAX_RETRIES", int),
+    ("max_response_bytes", "MAX_RESPONSE_BYTES", int),
+    ("cache_ttl_seconds", "CACHE_TTL_SECONDS", int),
+    ("enable_caching", "ENABLE_CACHING", _parse_bool),
+)
+
+
+# URL builders are keyed on their inputs rather than cached on the instance, so
+# they stay correct if a Config field is changed after construction.
+@lru_cache(maxsize=16)
+def _base_url(organization: str) -> str:
+    return f"https://dev.azure.com/{organization}"
+
+
+@lru_cache(maxsize=16)
+def _api_url(organization: str) -> str:
+    return f"{_base_url(organization)}/_apis"
+
+
+@lru_cache(maxsize=128)
+def _project_api_url(organization: str, project: str) -> str:
+    return f"{_base_url(organization)}/{project}/_apis"
+
+
+def _basic_credentials(personal_access_token: str) -> str:
+    # Azure DevOps uses basic auth with empty username and PAT as password
+    return base64.b64encode(f":{personal_access_token}".encode()).decode()
+
+
+@dataclass(slots=True)
 class Config:
     """Configuration for the MCP Azure DevOps Server."""
 
@@ -28,43 +73,69 @@ class Config:
     # HTTP Client Configuration
     request_timeout: int = 30
     max_retries: int = 3
+    max_response_bytes: int = 32 * 1024 * 1024
 
     # Cache Configuration
     cache_ttl_seconds: int = 300
     enable_caching: bool = True
 
+    # (PAT, encoded credentials), kept on the instance so tokens are never
+    # memoized process-wide
+    _credentials: Tuple[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._credentials = (
+            self.personal_access_token,
+            _basic_credentials(self.personal_access_token),
+        )
+
     @classmethod
-    def from_env(cls) -> "Config":
-        """Create configuration from environment variables."""
-        organization = os.getenv("AZURE_DEVOPS_ORGANIZATION")
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "Config":
+        """Create configuration from environment variables.
+
+        Args:
+            env: Variables to read instead of os.environ (and any .env file)
+        """
+        if env is None:
+            _load_dotenv_once()
+            # One plain-dict snapshot: later lookups skip os.environ's key/value
+            # encoding and cannot see the environment change mid-read
+            env = dict(os.environ)
+
+        organization = env.get("AZURE_DEVOPS_ORGANIZATION")
         if not organization:
             raise ValueError("AZURE_DEVOPS_ORGANIZATION environment variable is required")
 
-        pat = os.getenv("AZURE_DEVOPS_PAT")
+        pat = env.get("AZURE_DEVOPS_PAT")
         if not pat:
             raise ValueError("AZURE_DEVOPS_PAT environment variable is required")
 
-        return cls(
-            organization=organization,
-            personal_access_token=pat,
-            api_version=os.getenv("API_VERSION", "7.1"),
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            log_format=os.getenv("LOG_FORMAT", "json"),
-            request_timeout=int(os.getenv("REQUEST_TIMEOUT", "30")),
-            max_retries=int(os.getenv("MAX_RETRIES", "3")),
-            cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", "300")),
-            enable_caching=os.getenv("ENABLE_CACHING", "true").lower() == "true",
-        )
+        optional: Dict[str, Any] = {}
+        for attr, name, parse in _ENV_FIELDS:
+            value = env.get(name)
+            if value is not None:
+                optional[attr] = parse(value)
+        return cls(organization=organization, personal_access_token=pat, **optional)
 
     @property
     def base_url(self) -> str:
         """Get the base URL for Azure DevOps API."""
-        return f"https://dev.azure.com/{self.organization}"
+        return _base_url(self.organization)
 
     @property
     def api_url(self) -> str:
         """Get the organization-level API URL for Azure DevOps."""
-        return f"{self.base_url}/_apis"
+        return _api_url(self.organization)
+
+    @property
+    def auth_header(self) -> str:
+        """Get the base64-encoded basic auth credentials for the PAT."""
+        pat, encoded = self._credentials
+        if pat != self.personal_access_token:
+            pat = self.personal_access_token
+            encoded = _basic_credentials(pat)
+            self._credentials = (pat, encoded)
+        return encoded
 
     def project_api_url(self, project: str) -> str:
         """Get the project-specific API URL for Azure DevOps.
@@ -75,7 +146,7 @@ class Config:
         Returns:
             Project-specific API URL in format: https://dev.azure.com/{organization}/{project}/_apis
         """
-        return f"{self.base_url}/{project}/_apis"
+        return _project_api_url(self.organization, project)
 
     def validate(self) -> None:
         """Validate the configuration."""
@@ -91,5 +162,8 @@ class Config:
         if self.max_retries < 0:
             raise ValueError("Max retries must be non-negative")
 
+        if self.max_response_bytes <= 0:
+            raise ValueError("Max response bytes must be positive")
+
         if self.cache_ttl_seconds < 0:
             raise ValueError("Cache TTL must be non-negative")
@@ -3,8 +3,11 @@ MCP Server implementation for Azure DevOps using FastMCP.
 """
 
 import asyncio
+import functools
+import inspect
 import logging
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 
@@ -14,33 +17,154 @@ from .services import ServiceConnectionService, VariableGroupService
 
 logger = logging.getLogger(__name__)
 
-
-# Create FastMCP server instance
-mcp = FastMCP("Azure DevOps Server")
+ToolFunc = Callable[..., Awaitable[Dict[str, Any]]]
 
 
-# Global variables for services (initialized during startup)
+# Global variables for services (initialized on first use)
 client: Optional[AzureDevOpsClient] = None
 variable_group_service: Optional[VariableGroupService] = None
 service_connection_service: Optional[ServiceConnectionService] = None
 
+# Serializes first-call initialization so concurrent tools share one client
+_init_lock = asyncio.Lock()
+
 
-async def initialize_services():
+async def initialize_services() -> None:
     """Initialize services with configuration."""
     global client, variable_group_service, service_connection_service
 
+    async with _init_lock:
+        if client is not None:
+            return
+
+        try:
+            config = Config.from_env()
+            new_client = AzureDevOpsClient(config)
+            variable_group_service = VariableGroupService(new_client)
+            service_connection_service = ServiceConnectionService(new_client)
+            client = new_client
+            logger.info("Services initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize services: %s", e)
+            raise
+
+
+async def shutdown_services() -> None:
+    """Close the shared client and reset the services."""
+    global client, variable_group_service, service_connection_service
+
+    async with _init_lock:
+        if client is not None:
+            await client.close()
+        client = None
+        variable_group_service = None
+        service_connection_service = None
+
+
+async def _get_variable_group_service() -> VariableGroupService:
+    """Return the shared variable group service, initializing it on first use."""
+    if variable_group_service is None:
+        await initialize_services()
+    service = variable_group_service
+    if service is None:
+        # Shut down again before this call got to use it
+        raise RuntimeError("Variable group service is not initialized")
+    return service
+
+
+async def _get_service_connection_service() -> ServiceConnectionService:
+    """Return the shared service connection service, initializing it on first use."""
+    if service_connection_service is None:
+        await initialize_services()
+    service = service_connection_service
+    if service is None:
+        # Shut down again before this call got to use it
+        raise RuntimeError("Service connection service is not initialized")
+    return service
+
+
+# Sessions currently running inside _lifespan
+_active_sessions = 0
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP connection pool when the last session ends.
+
+    On non-stdio transports FastMCP enters the lifespan once per session, while
+    every session uses the same module-level client.
+    """
+    global _active_sessions
+
+    _active_sessions += 1
     try:
-        config = Config.from_env()
-        client = AzureDevOpsClient(config)
-        variable_group_service = VariableGroupService(client)
-        service_connection_service = ServiceConnectionService(client)
-        logger.info("Services initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
-        raise
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            await shutdown_services()
+
+
+# Create FastMCP server instance
+mcp = FastMCP("Azure DevOps Server", lifespan=_lifespan)
+
+
+def mcp_tool_result(
+    action: str, count: bool = False, raised_action: Optional[str] = None
+) -> Callable[[ToolFunc], ToolFunc]:
+    """Shape a service result dict into the tool response.
+
+    Args:
+        action: Operation used in error messages, e.g. "list variable groups"
+        count: Whether to include the number of returned items
+        raised_action: Operation used instead of action when the tool raises. It may
+            reference tool arguments, as in "get service connection {connection_id}".
+    """
+
+    def decorator(func: ToolFunc) -> ToolFunc:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                failed = f"Failed to {_describe(raised_action or action, signature, args, kwargs)}"
+                logger.error("%s: %s", failed, e)
+                return {"success": False, "error": str(e), "message": f"{failed}: {e}"}
+
+            if not result.get("success"):
+                return {
+                    "success": False,
+                    "error": result.get("error", "Unknown error"),
+                    "message": result["message"] if "message" in result else f"Failed to {action}",
+                }
+
+            response = {
+                "success": True,
+                "data": result.get("data", [] if count else None),
+                "message": result.get("message", ""),
+            }
+            if count:
+                response["count"] = len(response["data"])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _describe(
+    action: str, signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> str:
+    """Fill the action template with the tool's arguments (error path only)."""
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return action.format(**bound.arguments)
 
 
 @mcp.tool()
+@mcp_tool_result("list variable groups", count=True)
 async def list_variable_groups(project: str, group_name: Optional[str] = None) -> Dict[str, Any]:
     """
     List all variable groups in an Azure DevOps project.
@@ -52,37 +176,12 @@ async def list_variable_groups(project: str, group_name: Optional[str] = None) -
     Returns:
         Dictionary containing variable groups data
     """
-    if variable_group_service is None:
-        await initialize_services()
-
-    try:
-        result = await variable_group_service.list_variable_groups(
-            project=project, group_name=group_name
-        )
-        # Result is now a dictionary, not MCPToolResult
-        if result.get("success"):
-            return {
-                "success": True,
-                "data": result.get("data", []),
-                "message": result.get("message", ""),
-                "count": len(result.get("data", [])),
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "message": result.get("message", "Failed to list variable groups"),
-            }
-    except Exception as e:
-        logger.error(f"Error listing variable groups: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to list variable groups: {str(e)}",
-        }
+    service = await _get_variable_group_service()
+    return await service.list_variable_groups(project=project, group_name=group_name)
 
 
 @mcp.tool()
+@mcp_tool_result("get variable group details")
 async def get_variable_group(project: str, group_id: int) -> Dict[str, Any]:
     """
     Get detailed information about a specific variable group.
@@ -94,36 +193,12 @@ async def get_variable_group(project: str, group_id: int) -> Dict[str, Any]:
     Returns:
         Dictionary containing variable group details
     """
-    if variable_group_service is None:
-        await initialize_services()
-
-    try:
-        result = await variable_group_service.get_variable_group_details(
-            project=project, group_id=group_id
-        )
-        # Result is now a dictionary, not MCPToolResult
-        if result.get("success"):
-            return {
-                "success": True,
-                "data": result.get("data"),
-                "message": result.get("message", ""),
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "message": result.get("message", "Failed to get variable group details"),
-            }
-    except Exception as e:
-        logger.error(f"Error getting variable group details: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to get variable group details: {str(e)}",
-        }
+    service = await _get_variable_group_service()
+    return await service.get_variable_group_details(project=project, group_id=group_id)
 
 
 @mcp.tool()
+@mcp_tool_result("list service connections", count=True)
 async def list_service_connections(
     project: str, connection_type: Optional[str] = None, include_shared: bool = True
 ) -> Dict[str, Any]:
@@ -138,37 +213,16 @@ async def list_service_connections(
     Returns:
         Dictionary containing service connections data
     """
-    if service_connection_service is None:
-        await initialize_services()
-
-    try:
-        result = await service_connection_service.list_service_connections(
-            project=project, connection_type=connection_type, include_shared=include_shared
-        )
-        # Result is now a dictionary, not MCPToolResult
-        if result.get("success"):
-            return {
-                "success": True,
-                "data": result.get("data", []),
-                "message": result.get("message", ""),
-                "count": len(result.get("data", [])),
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "message": result.get("message", "Failed to list service connections"),
-            }
-    except Exception as e:
-        logger.error(f"Error listing service connections: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to list service connections: {str(e)}",
-        }
+    service = await _get_service_connection_service()
+    return await service.list_service_connections(
+        project=project, connection_type=connection_type, include_shared=include_shared
+    )
 
 
 @mcp.tool()
+@mcp_tool_result(
+    "get service connection details", raised_action="get service connection {connection_id}"
+)
 async def get_service_connection(project: str, connection_id: str) -> Dict[str, Any]:
     """
     Get detailed information about a specific service connection.
@@ -180,33 +234,10 @@ async def get_service_connection(project: str, connection_id: str) -> Dict[str,
     Returns:
         Dictionary containing service connection details
     """
-    if service_connection_service is None:
-        await initialize_services()
-
-    try:
-        result = await service_connection_service.get_service_connection_details(
-            project=project, connection_id=connection_id
-        )
-        # Result is now a dictionary, not MCPToolResult
-        if result.get("success"):
-            return {
-                "success": True,
-                "data": result.get("data"),
-                "message": result.get("message", ""),
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.get("error", "Unknown error"),
-                "message": result.get("message", "Failed to get service connection details"),
-            }
-    except Exception as e:
-        logger.error(f"Error getting service connection {connection_id}: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to get service connection {connection_id}: {str(e)}",
-        }
+    service = await _get_service_connection_service()
+    return await service.get_service_connection_details(
+        project=project, connection_id=connection_id
+    )
 
 
 def run_server():
@@ -221,7 +252,7 @@ def run_server():
         mcp.run()
 
     except Exception as e:
-        logger.error(f"Failed to start server: {e}")
+        logger.error("Failed to start server: %s", e)
         raise
 
 
@@ -2,36 +2,62 @@
 Main entry point for the MCP Azure DevOps Server.
 """
 
+import argparse
 import logging
+import os
 import sys
-from typing import Optional
+from typing import Any, Optional, Sequence
 
-import click
+# The MCP SDK, httpx and structlog are imported only once they are needed, so
+# that --help and argument errors return without loading the server stack.
 
-from .fastmcp_server import run_server
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSON serializer for structlog's renderer; logging handlers expect str."""
+    import orjson
+
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+def _json_formatter() -> logging.Formatter:
+    """Build a formatter that renders stdlib log records as one JSON object per line."""
+    import structlog
+
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.ExtraAdder(),
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.EventRenamer("message"),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+        ],
+    )
 
 
 def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
     """Setup logging configuration."""
     level = getattr(logging, log_level.upper(), logging.INFO)
 
+    formatter: logging.Formatter
     if log_format.lower() == "json":
-        # For production, you might want to use a JSON formatter like structlog
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", '
-            '"logger": "%(name)s", "message": "%(message)s"}'
-        )
+        formatter = _json_formatter()
     else:
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(formatter)
 
-    # Configure root logger
+    # Configure root logger; force replaces the handler FastMCP installs on import
     logging.basicConfig(
         level=level,
         handlers=[handler],
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        force=True,
     )
 
     # Set specific logger levels
@@ -39,22 +65,61 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
-@click.command()
-@click.option("--config", type=click.Path(exists=True), help="Path to configuration file")
-@click.option(
-    "--log-level",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
-    default="INFO",
-    help="Logging level",
-)
-@click.option(
-    "--log-format",
-    type=click.Choice(["json", "text"], case_sensitive=False),
-    default="json",
-    help="Logging format",
-)
-def main(config: Optional[str] = None, log_level: str = "INFO", log_format: str = "json") -> None:
+def install_uvloop() -> bool:
+    """Use uvloop for the server's event loop when it is installed.
+
+    uvloop is an optional extra and is not available on Windows, where the default
+    asyncio loop is kept.
+    """
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return False
+
+    import asyncio
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def _existing_path(value: str) -> str:
+    """argparse type for a path that must already exist."""
+    if not os.path.exists(value):
+        raise argparse.ArgumentTypeError(f"Path '{value}' does not exist.")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(
+        prog="mcp-ado-server",
+        description="MCP Azure DevOps Server - A Model Context Protocol server for Azure DevOps.",
+    )
+    parser.add_argument("--config", type=_existing_path, help="Path to configuration file")
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Logging level",
+    )
+    parser.add_argument(
+        "--log-format",
+        type=str.lower,
+        choices=["json", "text"],
+        default="json",
+        help="Logging format",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     """MCP Azure DevOps Server - A Model Context Protocol server for Azure DevOps."""
+    args = build_parser().parse_args(argv)
+    config: Optional[str] = args.config
+    log_level: str = args.log_level
+    log_format: str = args.log_format
+
     try:
         # Setup logging
         setup_logging(log_level, log_format)
@@ -63,7 +128,12 @@ def main(config: Optional[str] = None, log_level: str = "INFO", log_format: str
         logger.info("Starting MCP Azure DevOps Server")
 
         if config:
-            logger.info(f"Using configuration file: {config}")
+            logger.info("Using configuration file: %s", config)
+
+        if install_uvloop():
+            logger.info("Using uvloop event loop")
+
+        from .fastmcp_server import run_server
 
         # Run the FastMCP server
         run_server()
@@ -72,7 +142,7 @@ def main(config: Optional[str] = None, log_level: str = "INFO", log_format: str
         logging.getLogger(__name__).info("Server stopped by user")
         sys.exit(0)
     except Exception as e:
-        logging.getLogger(__name__).error(f"Fatal error: {e}", exc_info=True)
+        logging.getLogger(__name__).error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
 
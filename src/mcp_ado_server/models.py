@@ -5,8 +5,23 @@ Data models for Azure DevOps resources.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+import orjson
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an Azure DevOps ISO-8601 timestamp.
+
+    Python 3.10's fromisoformat does not accept a trailing "Z". Timestamps repeat a lot
+    across list responses, and datetimes are immutable, so results are memoized.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
 
 class VariableGroupType(str, Enum):
     """Types of variable groups."""
@@ -25,7 +40,12 @@ class ServiceConnectionType(str, Enum):
     GENERIC = "generic"
 
 
-@dataclass
+# Value -> member tables, so list responses skip Enum's value lookup per item
+_VARIABLE_GROUP_TYPES = {member.value: member for member in VariableGroupType}
+_SERVICE_CONNECTION_TYPES = {member.value: member for member in ServiceConnectionType}
+
+
+@dataclass(slots=True)
 class User:
     """Represents a user in Azure DevOps."""
 
@@ -34,8 +54,18 @@ class User:
     unique_name: str
     image_url: Optional[str] = None
 
+    @classmethod
+    def from_api_response(cls, data: Dict[str, Any]) -> "User":
+        """Create a User from an Azure DevOps identity reference."""
+        return cls(
+            id=data["id"],
+            display_name=data["displayName"],
+            unique_name=data["uniqueName"],
+            image_url=data.get("imageUrl"),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class VariableValue:
     """Represents a variable value in a variable group."""
 
@@ -44,7 +74,7 @@ class VariableValue:
     is_readonly: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableGroup:
     """Represents an Azure DevOps variable group."""
 
@@ -64,41 +94,32 @@ class VariableGroup:
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> "VariableGroup":
         """Create a VariableGroup from Azure DevOps API response."""
-        variables = {}
-        for key, var_data in data.get("variables", {}).items():
-            variables[key] = VariableValue(
+        variables = {
+            key: VariableValue(
                 value=var_data.get("value"),
                 is_secret=var_data.get("isSecret", False),
                 is_readonly=var_data.get("isReadonly", False),
             )
+            for key, var_data in data.get("variables", {}).items()
+        }
 
         return cls(
             id=data["id"],
             name=data["name"],
             description=data.get("description"),
-            type=VariableGroupType(data["type"]),
+            type=_VARIABLE_GROUP_TYPES.get(data["type"]) or VariableGroupType(data["type"]),
             variables=variables,
-            created_by=User(
-                id=data["createdBy"]["id"],
-                display_name=data["createdBy"]["displayName"],
-                unique_name=data["createdBy"]["uniqueName"],
-                image_url=data["createdBy"].get("imageUrl"),
-            ),
-            created_on=datetime.fromisoformat(data["createdOn"].replace("Z", "+00:00")),
-            modified_by=User(
-                id=data["modifiedBy"]["id"],
-                display_name=data["modifiedBy"]["displayName"],
-                unique_name=data["modifiedBy"]["uniqueName"],
-                image_url=data["modifiedBy"].get("imageUrl"),
-            ),
-            modified_on=datetime.fromisoformat(data["modifiedOn"].replace("Z", "+00:00")),
+            created_by=User.from_api_response(data["createdBy"]),
+            created_on=_parse_iso(data["createdOn"]),
+            modified_by=User.from_api_response(data["modifiedBy"]),
+            modified_on=_parse_iso(data["modifiedOn"]),
             project_id=data.get("projectId"),
             project_name=data.get("projectName"),
             provider_data=data.get("providerData"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceEndpointAuthorization:
     """Represents authorization for a service endpoint."""
 
@@ -106,7 +127,7 @@ class ServiceEndpointAuthorization:
     parameters: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceConnection:
     """Represents an Azure DevOps service connection."""
 
@@ -132,19 +153,18 @@ class ServiceConnection:
             scheme=auth_data.get("scheme", ""), parameters=auth_data.get("parameters", {})
         )
 
-        created_by = None
-        if "createdBy" in data:
-            created_by = User(
-                id=data["createdBy"]["id"],
-                display_name=data["createdBy"]["displayName"],
-                unique_name=data["createdBy"]["uniqueName"],
-                image_url=data["createdBy"].get("imageUrl"),
-            )
+        created_by_data = data.get("createdBy")
+        created_by = User.from_api_response(created_by_data) if created_by_data else None
+
+        refs = data.get("serviceEndpointProjectReferences")
+        project = (refs[0].get("projectReference") if refs else None) or {}
 
         return cls(
             id=data["id"],
             name=data["name"],
-            type=ServiceConnectionType(data.get("type", "generic")),
+            type=_SERVICE_CONNECTION_TYPES.get(
+                data.get("type", "generic"), ServiceConnectionType.GENERIC
+            ),
             url=data.get("url"),
             description=data.get("description"),
             authorization=authorization,
@@ -153,16 +173,12 @@ class ServiceConnection:
             is_ready=data.get("isReady", False),
             owner=data.get("owner", ""),
             created_by=created_by,
-            project_id=data.get("serviceEndpointProjectReferences", [{}])[0]
-            .get("projectReference", {})
-            .get("id"),
-            project_name=data.get("serviceEndpointProjectReferences", [{}])[0]
-            .get("projectReference", {})
-            .get("name"),
+            project_id=project.get("id"),
+            project_name=project.get("name"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """Represents an Azure DevOps project."""
 
@@ -184,11 +200,11 @@ class Project:
             url=data["url"],
             state=data["state"],
             visibility=data["visibility"],
-            last_update_time=datetime.fromisoformat(data["lastUpdateTime"].replace("Z", "+00:00")),
+            last_update_time=_parse_iso(data["lastUpdateTime"]),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MCPToolResult:
     """Represents the result of an MCP tool execution."""
 
@@ -197,8 +213,12 @@ class MCPToolResult:
 
     @classmethod
     def success(cls, data: Any, message: Optional[str] = None) -> "MCPToolResult":
-        """Create a successful result."""
-        content = [{"type": "text", "text": str(data)}]
+        """Create a successful result.
+
+        Non-string data is rendered as JSON (not Python repr) so clients can parse it.
+        """
+        text = data if isinstance(data, str) else orjson.dumps(data, default=str).decode()
+        content = [{"type": "text", "text": text}]
         if message:
             content.insert(0, {"type": "text", "text": message})
         return cls(content=content, is_error=False)
@@ -4,34 +4,63 @@ Security utilities for MCP Azure DevOps Server.
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from secrets import token_hex
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Union
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_key_regex(exact: Iterable[str], substrings: Iterable[str]) -> Pattern[str]:
+    """Build one pattern matching normalized key names exactly or by substring."""
+    exact_alternation = "|".join(sorted({re.escape(p.replace("_", "")) for p in exact}))
+    substring_alternation = "|".join(re.escape(p) for p in substrings)
+    return re.compile(f"^(?:{exact_alternation})$|{substring_alternation}")
+
+
+# Correlation ID of the operation running in the current context; SecureLogger
+# falls back to it when a call does not pass one explicitly
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+# A key=value pair starting at a parameter boundary; bare keys are left alone
+_QUERY_PARAM_RE = re.compile(r"(?:^|(?<=&))([^&=]+)=([^&]*)")
+
+
 class SecurityFilter:
     """Security utilities for filtering sensitive data from logs and responses."""
 
+    __slots__ = ()
+
+    # Markers substituted for sensitive values; headers and service connection
+    # fields use REDACTED, secret variable group values SECRET
+    FILTERED = "[FILTERED]"
+    REDACTED = "[REDACTED]"
+    SECRET = "[SECRET]"
+
     # Common patterns that indicate sensitive data
-    SENSITIVE_PATTERNS = [
-        "password",
-        "secret",
-        "token",
-        "apikey",
-        "api_key",
-        "accesskey",
-        "access_key",
-        "secretkey",
-        "secret_key",
-        "credential",
-        "auth",
-        "bearer",
-        "authorization",
-        "pat",
-        "client_secret",
-        "client_id",
-        "tenant_id",
-    ]
+    SENSITIVE_PATTERNS: FrozenSet[str] = frozenset(
+        {
+            "password",
+            "secret",
+            "token",
+            "apikey",
+            "api_key",
+            "accesskey",
+            "access_key",
+            "secretkey",
+            "secret_key",
+            "credential",
+            "auth",
+            "bearer",
+            "authorization",
+            "pat",
+            "client_secret",
+            "client_id",
+            "tenant_id",
+        }
+    )
 
     # Regex patterns for common secret formats
     SECRET_REGEXES = [
@@ -45,113 +74,144 @@ class SecurityFilter:
         re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"),
     ]
 
-    @classmethod
-    def is_sensitive_key(cls, key: str) -> bool:
-        """Check if a key name indicates sensitive data."""
-        if not key:
-            return False
+    # All secret formats fused into one alternation, so each value is scanned once
+    _SECRET_RE = re.compile("|".join(f"(?:{p.pattern})" for p in SECRET_REGEXES))
+    _MIN_SECRET_LENGTH = 20
 
-        key_lower = key.lower().replace("_", "").replace("-", "")
-
-        # Check for exact matches first
-        if key_lower in cls.SENSITIVE_PATTERNS:
-            return True
-
-        # Check for patterns that should match as substrings
-        substring_patterns = [
-            "password",
-            "secret",
-            "token",
-            "credential",
-            "auth",
-            "bearer",
-            "authorization",
-            "pat",
-        ]
-        for pattern in substring_patterns:
-            if pattern in key_lower:
-                return True
-
-        # Check for specific API key patterns
-        api_key_patterns = [
+    # Key names (lowercased, "_" and "-" removed) that are sensitive wherever they
+    # appear, and ones that are only sensitive as the whole key
+    SUBSTRING_KEY_PATTERNS = (
+        "password",
+        "secret",
+        "token",
+        "credential",
+        "auth",
+        "bearer",
+        "authorization",
+        "pat",
+    )
+    EXACT_KEY_PATTERNS = frozenset(
+        {
             "apikey",
             "accesskey",
             "secretkey",
             "clientsecret",
             "clientid",
             "tenantid",
-        ]
-        for pattern in api_key_patterns:
-            if pattern == key_lower:
-                return True
+        }
+    )
 
-        return False
+    # One scan replaces the per-pattern loops
+    _KEY_RE = _compile_key_regex(
+        exact=SENSITIVE_PATTERNS | EXACT_KEY_PATTERNS, substrings=SUBSTRING_KEY_PATTERNS
+    )
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def is_sensitive_key(cls, key: str) -> bool:
+        """Check if a key name indicates sensitive data."""
+        if not key:
+            return False
+
+        key_lower = key.lower().replace("_", "").replace("-", "")
+        return cls._KEY_RE.search(key_lower) is not None
 
     @classmethod
     def is_sensitive_value(cls, value: str) -> bool:
         """Check if a value matches common secret patterns."""
-        if not isinstance(value, str) or len(value) < 10:
+        # No secret pattern can match fewer characters than this
+        if not isinstance(value, str) or len(value) < cls._MIN_SECRET_LENGTH:
             return False
 
         # Check against known secret patterns
-        for pattern in cls.SECRET_REGEXES:
-            if pattern.fullmatch(value):
-                return True
-
-        return False
+        return cls._SECRET_RE.fullmatch(value) is not None
 
     @classmethod
     def filter_sensitive_dict(
-        cls, data: Dict[str, Any], replacement: str = "[FILTERED]", deep_scan: bool = True
+        cls, data: Dict[str, Any], replacement: str = FILTERED, deep_scan: bool = True
     ) -> Dict[str, Any]:
         """Filter sensitive data from dictionary."""
         if not isinstance(data, dict):
             return data
 
-        filtered = {}
-        for key, value in data.items():
-            # Check if key indicates sensitive data
-            if cls.is_sensitive_key(key):
-                filtered[key] = replacement
-            elif isinstance(value, dict) and deep_scan:
-                # Recursively filter nested dictionaries
-                filtered[key] = cls.filter_sensitive_dict(value, replacement, deep_scan)
-            elif isinstance(value, list) and deep_scan:
-                # Filter lists that might contain dictionaries
-                filtered[key] = [
-                    cls.filter_sensitive_dict(item, replacement, deep_scan)
-                    if isinstance(item, dict)
-                    else item
-                    for item in value
-                ]
-            elif isinstance(value, str) and deep_scan and cls.is_sensitive_value(value):
-                # Check if value looks like a secret
-                filtered[key] = replacement
-            else:
-                filtered[key] = value
-
-        return filtered
+        # Most payloads contain nothing sensitive; hand those back without copying
+        if not cls._contains_sensitive(data, deep_scan):
+            return data
 
-    @classmethod
-    def filter_url_params(cls, url: str, replacement: str = "[FILTERED]") -> str:
-        """Filter sensitive data from URL parameters."""
-        if "?" not in url:
-            return url
+        return cls._filter_dict(data, replacement, deep_scan)
 
-        base_url, query_string = url.split("?", 1)
-        params = []
+    @classmethod
+    def _contains_sensitive(cls, data: Dict[str, Any], deep_scan: bool) -> bool:
+        """Check whether filter_sensitive_dict would change anything in data."""
+        # Walk nested containers with an explicit stack rather than recursion
+        stack = [data]
+        while stack:
+            for key, value in stack.pop().items():
+                if cls.is_sensitive_key(key):
+                    return True
+                if not deep_scan:
+                    continue
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(item for item in value if isinstance(item, dict))
+                elif isinstance(value, str) and cls.is_sensitive_value(value):
+                    return True
+        return False
 
-        for param in query_string.split("&"):
-            if "=" in param:
-                key, value = param.split("=", 1)
+    @classmethod
+    def _filter_dict(
+        cls, data: Dict[str, Any], replacement: str, deep_scan: bool
+    ) -> Dict[str, Any]:
+        """Return a filtered copy of data."""
+        root: Dict[str, Any] = {}
+        # (source, destination) pairs still to be filled in
+        stack = [(data, root)]
+        while stack:
+            source, filtered = stack.pop()
+            for key, value in source.items():
+                # Check if key indicates sensitive data
                 if cls.is_sensitive_key(key):
-                    params.append(f"{key}={replacement}")
+                    filtered[key] = replacement
+                elif isinstance(value, dict) and deep_scan:
+                    # Filter nested dictionaries
+                    child: Dict[str, Any] = {}
+                    filtered[key] = child
+                    stack.append((value, child))
+                elif isinstance(value, list) and deep_scan:
+                    # Lists without dictionaries have nothing to filter; skip the copy
+                    if not any(isinstance(item, dict) for item in value):
+                        filtered[key] = value
+                        continue
+                    items = []
+                    for item in value:
+                        if isinstance(item, dict):
+                            child = {}
+                            stack.append((item, child))
+                            items.append(child)
+                        else:
+                            items.append(item)
+                    filtered[key] = items
+                elif isinstance(value, str) and deep_scan and cls.is_sensitive_value(value):
+                    # Check if value looks like a secret
+                    filtered[key] = replacement
                 else:
-                    params.append(param)
-            else:
-                params.append(param)
+                    filtered[key] = value
+
+        return root
+
+    @classmethod
+    def filter_url_params(cls, url: str, replacement: str = FILTERED) -> str:
+        """Filter sensitive data from URL parameters."""
+        base_url, sep, query_string = url.partition("?")
+        if not sep:
+            return url
+
+        def mask(match: "re.Match[str]") -> str:
+            key = match.group(1)
+            return f"{key}={replacement}" if cls.is_sensitive_key(key) else match.group(0)
 
-        return f"{base_url}?{'&'.join(params)}"
+        return f"{base_url}?{_QUERY_PARAM_RE.sub(mask, query_string)}"
 
     @classmethod
     def sanitize_for_logging(
@@ -173,7 +233,7 @@ class SecurityFilter:
 
         if headers:
             # Always filter headers as they often contain auth tokens
-            sanitized["headers"] = cls.filter_sensitive_dict(headers, "[REDACTED]")
+            sanitized["headers"] = cls.filter_sensitive_dict(headers, cls.REDACTED)
 
         if json_data:
             sanitized["json_data"] = cls.filter_sensitive_dict(json_data)
@@ -181,12 +241,24 @@ class SecurityFilter:
         return sanitized
 
 
+# SecurityFilter holds no state, so every logger shares one instance
+_SECURITY_FILTER = SecurityFilter()
+
+
 class SecureLogger:
     """Secure logging wrapper that automatically filters sensitive data."""
 
+    __slots__ = ("logger", "security_filter")
+
+    _SEVERITY_LEVELS = {"ERROR": logging.ERROR, "WARNING": logging.WARNING}
+
     def __init__(self, logger_instance: logging.Logger):
         self.logger = logger_instance
-        self.security_filter = SecurityFilter()
+        self.security_filter = _SECURITY_FILTER
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a record at this level would be emitted by the wrapped logger."""
+        return self.logger.isEnabledFor(level)
 
     def debug_request(
         self,
@@ -198,45 +270,47 @@ class SecureLogger:
         correlation_id: Optional[str] = None,
     ) -> None:
         """Log HTTP request with security filtering."""
+        # Sanitizing and formatting is only worth doing if the record is emitted
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
+        correlation_id = correlation_id or _correlation_id.get()
         sanitized = SecurityFilter.sanitize_for_logging(method, url, params, headers, json_data)
 
         # Format the log message in a more readable way for debugging
-        parts = []
-        parts.append(f"method={sanitized['method']}")
-        parts.append(f"url={sanitized['url']}")
-
-        if "params" in sanitized:
-            param_strs = [f"{k}={v}" for k, v in sanitized["params"].items()]
-            parts.append(f"params=({', '.join(param_strs)})")
-
-        if "headers" in sanitized:
-            header_strs = [f"{k}={v}" for k, v in sanitized["headers"].items()]
-            parts.append(f"headers=({', '.join(header_strs)})")
-
-        if "json_data" in sanitized:
-            json_strs = [f"{k}={v}" for k, v in sanitized["json_data"].items()]
-            parts.append(f"json_data=({', '.join(json_strs)})")
-
-        log_message = f"HTTP Request: {', '.join(parts)}"
-        if correlation_id:
-            log_message = f"[{correlation_id}] {log_message}"
-
-        self.logger.debug(log_message)
+        parts = [f"method={sanitized['method']}", f"url={sanitized['url']}"]
+        for section in ("params", "headers", "json_data"):
+            values = sanitized.get(section)
+            if values:
+                pairs = ", ".join(f"{k}={v}" for k, v in values.items())
+                parts.append(f"{section}=({pairs})")
+
+        prefix = f"[{correlation_id}] " if correlation_id else ""
+        self.logger.debug(
+            "%sHTTP Request: %s", prefix, ", ".join(parts), extra={"sanitized": sanitized}
+        )
 
     def debug_response(
         self, status_code: int, response_size: int, correlation_id: Optional[str] = None
     ) -> None:
         """Log HTTP response with security context."""
-        log_message = f"HTTP Response: status={status_code}, size={response_size}bytes"
-        if correlation_id:
-            log_message = f"[{correlation_id}] {log_message}"
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
 
-        self.logger.debug(log_message)
+        correlation_id = correlation_id or _correlation_id.get()
+        prefix = f"[{correlation_id}] " if correlation_id else ""
+        self.logger.debug(
+            "%sHTTP Response: status=%s, size=%sbytes", prefix, status_code, response_size
+        )
 
     def error_with_context(
         self, message: str, error: Exception, correlation_id: Optional[str] = None, **context
     ) -> None:
         """Log error with filtered context."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+
+        correlation_id = correlation_id or _correlation_id.get()
         filtered_context = SecurityFilter.filter_sensitive_dict(context)
 
         log_message = f"Error: {message} - {type(error).__name__}: {str(error)}"
@@ -251,6 +325,10 @@ class SecureLogger:
         self, message: str, correlation_id: Optional[str] = None, **context
     ) -> None:
         """Log info with filtered context."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        correlation_id = correlation_id or _correlation_id.get()
         filtered_context = SecurityFilter.filter_sensitive_dict(context)
 
         log_message = message
@@ -270,6 +348,12 @@ class SecureLogger:
         **context,
     ) -> None:
         """Log security-relevant events."""
+        # Log at appropriate level based on severity
+        level = self._SEVERITY_LEVELS.get(severity.upper(), logging.INFO)
+        if not self.logger.isEnabledFor(level):
+            return
+
+        correlation_id = correlation_id or _correlation_id.get()
         filtered_context = SecurityFilter.filter_sensitive_dict(context)
 
         log_message = f"SECURITY_EVENT: {event_type} | {description}"
@@ -278,20 +362,27 @@ class SecureLogger:
         if correlation_id:
             log_message = f"[{correlation_id}] {log_message}"
 
-        # Log at appropriate level based on severity
-        if severity.upper() == "ERROR":
-            self.logger.error(log_message)
-        elif severity.upper() == "WARNING":
-            self.logger.warning(log_message)
-        else:
-            self.logger.info(log_message)
+        self.logger.log(level, log_message)
 
 
 def create_correlation_id() -> str:
     """Create a unique correlation ID for request tracing."""
-    import uuid
-
-    return str(uuid.uuid4())[:8]
+    return token_hex(4)
+
+
+@contextmanager
+def bind_correlation_id() -> Iterator[str]:
+    """Use a new correlation ID for SecureLogger calls made inside the with block.
+
+    The previous ID is restored on exit. asyncio tasks each run in a copy of the
+    context, so concurrent operations keep their own IDs.
+    """
+    correlation_id = create_correlation_id()
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
 
 
 def get_secure_logger(name: str) -> SecureLogger:
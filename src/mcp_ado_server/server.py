@@ -2,10 +2,11 @@
 MCP Server implementation for Azure DevOps.
 """
 
-import json
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
+import orjson
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
@@ -24,6 +25,90 @@ from .services import ServiceConnectionService, VariableGroupService
 
 logger = logging.getLogger(__name__)
 
+# Pretty-printed like json.dumps(indent=2); non-string keys are stringified and
+# UTC datetimes use the "Z" suffix
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the types orjson does not handle natively.
+
+    Datetimes, UUIDs, enums and dataclasses never reach this hook.
+    """
+    model_dump = getattr(obj, "model_dump", None)
+    if callable(model_dump):
+        return model_dump(mode="json")
+    return str(obj)
+
+
+def _dumps(data: Any) -> str:
+    """Format structured tool output as indented JSON."""
+    return orjson.dumps(data, option=_JSON_OPTIONS, default=_json_default).decode()
+
+
+# The tool set is static, so it is built once rather than on every list_tools call
+_TOOLS = [
+    Tool(
+        name="list_variable_groups",
+        description="List all variable groups in an Azure DevOps project",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Project name or ID"},
+                "group_name": {
+                    "type": "string",
+                    "description": "Filter by group name (optional)",
+                },
+            },
+            "required": ["project"],
+        },
+    ),
+    Tool(
+        name="get_variable_group_details",
+        description="Get detailed information about a specific variable group",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Project name or ID"},
+                "group_id": {"type": "integer", "description": "Variable group ID"},
+            },
+            "required": ["project", "group_id"],
+        },
+    ),
+    Tool(
+        name="list_service_connections",
+        description="List all service connections in an Azure DevOps project",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Project name or ID"},
+                "type": {
+                    "type": "string",
+                    "description": "Filter by connection type (optional)",
+                },
+                "include_shared": {
+                    "type": "boolean",
+                    "description": "Include shared connections",
+                    "default": True,
+                },
+            },
+            "required": ["project"],
+        },
+    ),
+    Tool(
+        name="get_service_connection_details",
+        description="Get detailed information about a specific service connection",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Project name or ID"},
+                "connection_id": {"type": "string", "description": "Service connection ID"},
+            },
+            "required": ["project", "connection_id"],
+        },
+    ),
+]
+
 
 class MCPAzureDevOpsServer:
     """MCP Server for Azure DevOps interactions."""
@@ -34,6 +119,9 @@ class MCPAzureDevOpsServer:
         self.client: Optional[AzureDevOpsClient] = None
         self.variable_group_service: Optional[VariableGroupService] = None
         self.service_connection_service: Optional[ServiceConnectionService] = None
+        self._tools_result = ListToolsResult(tools=_TOOLS)
+        # Tool name -> (service method, {tool argument: method parameter})
+        self._dispatch: Dict[str, Tuple[Callable[..., Awaitable[Any]], Dict[str, str]]] = {}
 
         # Register handlers
         self._register_handlers()
@@ -45,69 +133,7 @@ class MCPAzureDevOpsServer:
 
     async def _list_tools(self, request: ListToolsRequest) -> ListToolsResult:
         """List available tools."""
-        tools = [
-            Tool(
-                name="list_variable_groups",
-                description="List all variable groups in an Azure DevOps project",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project": {"type": "string", "description": "Project name or ID"},
-                        "group_name": {
-                            "type": "string",
-                            "description": "Filter by group name (optional)",
-                        },
-                    },
-                    "required": ["project"],
-                },
-            ),
-            Tool(
-                name="get_variable_group_details",
-                description="Get detailed information about a specific variable group",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project": {"type": "string", "description": "Project name or ID"},
-                        "group_id": {"type": "integer", "description": "Variable group ID"},
-                    },
-                    "required": ["project", "group_id"],
-                },
-            ),
-            Tool(
-                name="list_service_connections",
-                description="List all service connections in an Azure DevOps project",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project": {"type": "string", "description": "Project name or ID"},
-                        "type": {
-                            "type": "string",
-                            "description": "Filter by connection type (optional)",
-                        },
-                        "include_shared": {
-                            "type": "boolean",
-                            "description": "Include shared connections",
-                            "default": True,
-                        },
-                    },
-                    "required": ["project"],
-                },
-            ),
-            Tool(
-                name="get_service_connection_details",
-                description="Get detailed information about a specific service connection",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project": {"type": "string", "description": "Project name or ID"},
-                        "connection_id": {"type": "string", "description": "Service connection ID"},
-                    },
-                    "required": ["project", "connection_id"],
-                },
-            ),
-        ]
-
-        return ListToolsResult(tools=tools)
+        return self._tools_result
 
     async def _call_tool(self, request: CallToolRequest) -> CallToolResult:
         """Handle tool calls."""
@@ -123,48 +149,51 @@ class MCPAzureDevOpsServer:
             tool_name = request.params.name
             arguments = request.params.arguments or {}
 
-            if tool_name == "list_variable_groups":
-                result = await self.variable_group_service.list_variable_groups(
-                    project=arguments["project"], group_name=arguments.get("group_name")
-                )
-            elif tool_name == "get_variable_group_details":
-                result = await self.variable_group_service.get_variable_group_details(
-                    project=arguments["project"], group_id=arguments["group_id"]
-                )
-            elif tool_name == "list_service_connections":
-                result = await self.service_connection_service.list_service_connections(
-                    project=arguments["project"],
-                    connection_type=arguments.get("type"),
-                    include_shared=arguments.get("include_shared", True),
-                )
-            elif tool_name == "get_service_connection_details":
-                result = await self.service_connection_service.get_service_connection_details(
-                    project=arguments["project"], connection_id=arguments["connection_id"]
-                )
-            else:
+            entry = self._dispatch.get(tool_name)
+            if entry is None:
                 return CallToolResult(
                     content=[TextContent(type="text", text=f"Unknown tool: {tool_name}")],
                     isError=True,
                 )
 
-            # Convert result to MCP format
-            content = []
-            for item in result.content:
-                if item.get("type") == "text":
-                    content.append(TextContent(type="text", text=item["text"]))
-                else:
-                    # For structured data, convert to formatted JSON
-                    formatted_data = json.dumps(item, indent=2, default=str)
-                    content.append(TextContent(type="text", text=formatted_data))
+            handler, parameters = entry
+            result = await handler(
+                **{
+                    parameter: arguments[argument]
+                    for argument, parameter in parameters.items()
+                    if argument in arguments
+                }
+            )
 
-            return CallToolResult(content=content, isError=result.is_error)
+            return self._to_call_tool_result(result)
 
         except Exception as e:
-            logger.error(f"Error executing tool {request.params.name}: {e}")
+            logger.error("Error executing tool %s: %s", request.params.name, e)
             return CallToolResult(
                 content=[TextContent(type="text", text=f"Error: {str(e)}")], isError=True
             )
 
+    @staticmethod
+    def _to_call_tool_result(result: Dict[str, Any]) -> CallToolResult:
+        """Convert a service result dict into MCP tool output."""
+        if not result.get("success"):
+            error = result.get("error") or result.get("message") or "Unknown error"
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"Error: {error}")], isError=True
+            )
+
+        content = []
+        message = result.get("message")
+        if message:
+            content.append(TextContent(type="text", text=message))
+
+        # Structured data goes out as one JSON document, encoded in a single call
+        data = result.get("data")
+        if data is not None:
+            content.append(TextContent(type="text", text=_dumps(data)))
+
+        return CallToolResult(content=content, isError=False)
+
     async def initialize(self) -> None:
         """Initialize the server and services."""
         try:
@@ -175,10 +204,33 @@ class MCPAzureDevOpsServer:
             self.variable_group_service = VariableGroupService(self.client)
             self.service_connection_service = ServiceConnectionService(self.client)
 
+            self._dispatch = {
+                "list_variable_groups": (
+                    self.variable_group_service.list_variable_groups,
+                    {"project": "project", "group_name": "group_name"},
+                ),
+                "get_variable_group_details": (
+                    self.variable_group_service.get_variable_group_details,
+                    {"project": "project", "group_id": "group_id"},
+                ),
+                "list_service_connections": (
+                    self.service_connection_service.list_service_connections,
+                    {
+                        "project": "project",
+                        "type": "connection_type",
+                        "include_shared": "include_shared",
+                    },
+                ),
+                "get_service_connection_details": (
+                    self.service_connection_service.get_service_connection_details,
+                    {"project": "project", "connection_id": "connection_id"},
+                ),
+            }
+
             logger.info("MCP Azure DevOps Server initialized successfully")
 
         except Exception as e:
-            logger.error(f"Failed to initialize server: {e}")
+            logger.error("Failed to initialize server: %s", e)
             raise
 
     async def run(self) -> None:
@@ -186,32 +238,39 @@ class MCPAzureDevOpsServer:
         try:
             await self.initialize()
 
-            # Test connection
-            async with self.client as client:
-                if not await client.test_connection():
-                    raise RuntimeError("Failed to connect to Azure DevOps")
-
-            logger.info("Server initialized and connected successfully")
             logger.info("Available tools:")
-            tools_result = await self._list_tools(ListToolsRequest())
-            for tool in tools_result.tools:
-                logger.info(f"  - {tool.name}: {tool.description}")
+            for tool in self._tools_result.tools:
+                logger.info("  - %s: %s", tool.name, tool.description)
 
             logger.info("MCP server ready for STDIO communication")
             logger.info("Server will now wait for requests via STDIO...")
 
-            # Run the server with STDIO
-            async with stdio_server() as streams:
-                await self.server.run(
-                    streams[0],
-                    streams[1],
-                    InitializationOptions(
-                        server_name="mcp-ado-server",
-                        server_version="0.1.0",
-                        capabilities=self.server.get_capabilities(),
-                    ),
+            # Probe Azure DevOps while the STDIO server starts, instead of before it
+            async with self.client, stdio_server() as streams:
+                probe = asyncio.create_task(self.client.test_connection())
+                serve = asyncio.create_task(
+                    self.server.run(
+                        streams[0],
+                        streams[1],
+                        InitializationOptions(
+                            server_name="mcp-ado-server",
+                            server_version="0.1.0",
+                            capabilities=self.server.get_capabilities(),
+                        ),
+                    )
                 )
+                try:
+                    await asyncio.wait({probe, serve}, return_when=asyncio.FIRST_COMPLETED)
+                    if probe.done():
+                        if not probe.result():
+                            raise RuntimeError("Failed to connect to Azure DevOps")
+                        logger.info("Connected to Azure DevOps")
+                    await serve
+                finally:
+                    # A failed probe stops the server; a stopped server drops the probe
+                    for task in (probe, serve):
+                        task.cancel()
 
         except Exception as e:
-            logger.error(f"Server error: {e}")
+            logger.error("Server error: %s", e)
             raise
@@ -2,16 +2,133 @@
 Service layer for MCP Azure DevOps Server.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
 
-from .client import AzureDevOpsClient
+from .client import BULK_CONCURRENCY, AzureDevOpsAPIError, AzureDevOpsClient
 from .models import ServiceConnection, VariableGroup
-from .security import create_correlation_id, get_secure_logger
+from .security import SecurityFilter, bind_correlation_id, get_secure_logger
 
 logger = logging.getLogger(__name__)
 secure_logger = get_secure_logger(__name__)
 
+T = TypeVar("T")
+
+# Connection parameter/data keys whose values are never returned to clients. Keys
+# such as servicePrincipalKey, apitoken or credentials contain one of these words.
+_SECRET_KEY_TOKENS = ("password", "secret", "key", "token", "credential")
+_SECRET_KEY_RE = re.compile("|".join(_SECRET_KEY_TOKENS), re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _is_secret_key(key: str) -> bool:
+    """Check whether a service connection field name refers to a secret.
+
+    Connections share a small vocabulary of field names, so decisions are memoized.
+    """
+    return _SECRET_KEY_RE.search(key) is not None
+
+
+# Project IDs are GUIDs; anything else is treated as a project name
+_GUID_RE = re.compile(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}")
+
+
+# Returned by _fetch_in_project when the named project does not exist
+PROJECT_NOT_FOUND: Any = object()
+
+
+async def _fetch_in_project(
+    client: AzureDevOpsClient, project: str, fetch: Callable[[str], Awaitable[T]]
+) -> T:
+    """Run fetch(project) while checking that the project exists.
+
+    Azure DevOps accepts project names as well as IDs in resource URLs, so the
+    existence check for a name runs concurrently with the real request instead of
+    before it. IDs are only checked once the request comes back not found. Returns
+    PROJECT_NOT_FOUND if the project is missing, whatever the request raised.
+    """
+    if _GUID_RE.fullmatch(project):
+        try:
+            result = await fetch(project)
+        except AzureDevOpsAPIError as e:
+            if e.status_code != 404 or await client.get_project(project) is not None:
+                raise
+            return PROJECT_NOT_FOUND
+        # Item lookups report a 404 as None
+        if result is None and await client.get_project(project) is None:
+            return PROJECT_NOT_FOUND
+        return result
+
+    project_obj, result = await asyncio.gather(
+        client.get_project(project), fetch(project), return_exceptions=True
+    )
+    if isinstance(project_obj, BaseException):
+        raise project_obj
+    if project_obj is None:
+        return PROJECT_NOT_FOUND
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+async def _gather_bounded(calls: Iterable[Callable[[], Awaitable[T]]], concurrency: int) -> List[T]:
+    """Await each call with at most concurrency in flight, returning results in order."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+def _forget_project_on_not_found(
+    client: AzureDevOpsClient, project: str, error: Optional[Exception] = None
+) -> None:
+    """Drop a cached project lookup once a request under it came back not found.
+
+    A renamed or deleted project otherwise keeps resolving to a stale ID until the
+    cache entry expires.
+    """
+    if error is None or (isinstance(error, AzureDevOpsAPIError) and error.status_code == 404):
+        client.invalidate_project(project)
+
+
+def _variable_group_summary(vg: VariableGroup) -> Dict[str, Any]:
+    """Build the list_variable_groups entry for a variable group."""
+    variables = vg.variables
+    return {
+        "id": vg.id,
+        "name": vg.name,
+        "description": vg.description,
+        "type": vg.type.value,
+        "variable_count": len(variables),
+        "secret_count": sum(1 for var in variables.values() if var.is_secret),
+        "created_by": vg.created_by.display_name,
+        "created_on": vg.created_on.isoformat(),
+        "modified_by": vg.modified_by.display_name,
+        "modified_on": vg.modified_on.isoformat(),
+    }
+
+
+def _service_connection_summary(sc: ServiceConnection) -> Dict[str, Any]:
+    """Build the list_service_connections entry for a service connection."""
+    created_by = sc.created_by
+    return {
+        "id": sc.id,
+        "name": sc.name,
+        "type": sc.type.value,
+        "url": sc.url,
+        "description": sc.description,
+        "is_shared": sc.is_shared,
+        "is_ready": sc.is_ready,
+        "owner": sc.owner,
+        "created_by": created_by.display_name if created_by else "Unknown",
+    }
+
 
 class VariableGroupService:
     """Service for managing variable groups."""
@@ -23,23 +140,32 @@ class VariableGroupService:
         self, project: str, group_name: Optional[str] = None
     ) -> Dict[str, Any]:
         """List variable groups in a project."""
-        correlation_id = create_correlation_id()
-        try:
-            # Validate project exists
-            project_obj = await self.client.get_project(project)
-            if not project_obj:
+        with bind_correlation_id():
+            try:
+                variable_groups = await _fetch_in_project(
+                    self.client,
+                    project,
+                    lambda project_ref: self.client.get_variable_groups(
+                        project=project_ref, group_name=group_name
+                    ),
+                )
+            except Exception as e:
+                _forget_project_on_not_found(self.client, project, e)
+                secure_logger.error_with_context(
+                    message="Error listing variable groups",
+                    error=e,
+                    project=project,
+                    group_name=group_name,
+                )
+                return {"success": False, "error": str(e), "data": []}
+
+            if variable_groups is PROJECT_NOT_FOUND:
                 secure_logger.info_with_context(
                     message="Project not found during variable groups listing",
-                    correlation_id=correlation_id,
                     project=project,
                 )
                 return {"success": False, "error": f"Project '{project}' not found", "data": []}
 
-            # Get variable groups
-            variable_groups = await self.client.get_variable_groups(
-                project=project_obj.id, group_name=group_name
-            )
-
             if not variable_groups:
                 message = f"No variable groups found in project '{project}'"
                 if group_name:
@@ -47,25 +173,7 @@ class VariableGroupService:
                 return {"success": True, "data": [], "message": message}
 
             # Format results
-            results = []
-            for vg in variable_groups:
-                variable_count = len(vg.variables)
-                secret_count = sum(1 for var in vg.variables.values() if var.is_secret)
-
-                results.append(
-                    {
-                        "id": vg.id,
-                        "name": vg.name,
-                        "description": vg.description,
-                        "type": vg.type.value,
-                        "variable_count": variable_count,
-                        "secret_count": secret_count,
-                        "created_by": vg.created_by.display_name,
-                        "created_on": vg.created_on.isoformat(),
-                        "modified_by": vg.modified_by.display_name,
-                        "modified_on": vg.modified_on.isoformat(),
-                    }
-                )
+            results = [_variable_group_summary(vg) for vg in variable_groups]
 
             summary = f"Found {len(results)} variable group(s) in project '{project}'"
             if group_name:
@@ -73,7 +181,6 @@ class VariableGroupService:
 
             secure_logger.info_with_context(
                 message="Successfully retrieved variable groups",
-                correlation_id=correlation_id,
                 project=project,
                 group_count=len(results),
                 group_name=group_name,
@@ -81,35 +188,49 @@ class VariableGroupService:
 
             return {"success": True, "data": results, "message": summary}
 
-        except Exception as e:
-            secure_logger.error_with_context(
-                message="Error listing variable groups",
-                error=e,
-                correlation_id=correlation_id,
-                project=project,
-                group_name=group_name,
-            )
-            return {"success": False, "error": str(e), "data": []}
+    async def list_variable_groups_many(
+        self,
+        projects: List[str],
+        group_name: Optional[str] = None,
+        concurrency: int = BULK_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """List variable groups in several projects concurrently, in the order given."""
+        return await _gather_bounded(
+            (partial(self.list_variable_groups, project, group_name) for project in projects),
+            concurrency,
+        )
 
     async def get_variable_group_details(self, project: str, group_id: int) -> Dict[str, Any]:
         """Get detailed information about a specific variable group."""
-        correlation_id = create_correlation_id()
-        try:
-            # Validate project exists
-            project_obj = await self.client.get_project(project)
-            if not project_obj:
-                return {"success": False, "error": f"Project '{project}' not found"}
+        with bind_correlation_id():
+            try:
+                vg = await _fetch_in_project(
+                    self.client,
+                    project,
+                    lambda project_ref: self.client.get_variable_group(
+                        project=project_ref, group_id=group_id
+                    ),
+                )
+            except Exception as e:
+                _forget_project_on_not_found(self.client, project, e)
+                secure_logger.error_with_context(
+                    message="Error getting variable group details",
+                    error=e,
+                    project=project,
+                    group_id=group_id,
+                )
+                return {"success": False, "error": str(e)}
 
-            # Get variable group
-            vg = await self.client.get_variable_group(project=project_obj.id, group_id=group_id)
+            if vg is PROJECT_NOT_FOUND:
+                return {"success": False, "error": f"Project '{project}' not found"}
             if not vg:
+                _forget_project_on_not_found(self.client, project)
                 return {"success": False, "error": f"Variable group with ID {group_id} not found"}
 
             # Log security event for variable group access
             secure_logger.security_event(
                 event_type="VARIABLE_GROUP_ACCESS",
                 description=f"Variable group details accessed: {vg.name}",
-                correlation_id=correlation_id,
                 project=project,
                 group_id=group_id,
                 group_name=vg.name,
@@ -121,7 +242,14 @@ class VariableGroupService:
                 "name": vg.name,
                 "description": vg.description,
                 "type": vg.type.value,
-                "variables": {},
+                # Secret values are masked
+                "variables": {
+                    name: {
+                        "value": SecurityFilter.SECRET if var.is_secret else var.value,
+                        "is_secret": var.is_secret,
+                    }
+                    for name, var in vg.variables.items()
+                },
                 "created_by": {
                     "id": vg.created_by.id,
                     "display_name": vg.created_by.display_name,
@@ -138,29 +266,12 @@ class VariableGroupService:
                 "project_name": vg.project_name or project,
             }
 
-            # Include variables with values (secrets are masked)
-            for name, var in vg.variables.items():
-                result["variables"][name] = {
-                    "value": "[SECRET]" if var.is_secret else var.value,
-                    "is_secret": var.is_secret,
-                }
-
             return {
                 "success": True,
                 "data": result,
                 "message": f"Variable group '{vg.name}' details",
             }
 
-        except Exception as e:
-            secure_logger.error_with_context(
-                message="Error getting variable group details",
-                error=e,
-                correlation_id=correlation_id,
-                project=project,
-                group_id=group_id,
-            )
-            return {"success": False, "error": str(e)}
-
 
 class ServiceConnectionService:
     """Service for managing service connections."""
@@ -172,25 +283,30 @@ class ServiceConnectionService:
         self, project: str, connection_type: Optional[str] = None, include_shared: bool = True
     ) -> Dict[str, Any]:
         """List service connections in a project."""
-        correlation_id = create_correlation_id()
-        try:
-            # Validate project exists
-            project_obj = await self.client.get_project(project)
-            if not project_obj:
-                return {"success": False, "error": f"Project '{project}' not found", "data": []}
-
-            # Get service connections
-            service_connections = await self.client.get_service_connections(
-                project=project_obj.id, include_shared=include_shared
-            )
+        with bind_correlation_id():
+            try:
+                # Azure DevOps applies the type filter server-side
+                service_connections = await _fetch_in_project(
+                    self.client,
+                    project,
+                    lambda project_ref: self.client.get_service_connections(
+                        project=project_ref,
+                        connection_type=connection_type,
+                        include_shared=include_shared,
+                    ),
+                )
+            except Exception as e:
+                _forget_project_on_not_found(self.client, project, e)
+                secure_logger.error_with_context(
+                    message="Error listing service connections",
+                    error=e,
+                    project=project,
+                    connection_type=connection_type,
+                )
+                return {"success": False, "error": str(e), "data": []}
 
-            # Filter by connection type if specified
-            if connection_type:
-                service_connections = [
-                    sc
-                    for sc in service_connections
-                    if sc.type.value.lower() == connection_type.lower()
-                ]
+            if service_connections is PROJECT_NOT_FOUND:
+                return {"success": False, "error": f"Project '{project}' not found", "data": []}
 
             if not service_connections:
                 message = f"No service connections found in project '{project}'"
@@ -199,21 +315,7 @@ class ServiceConnectionService:
                 return {"success": True, "data": [], "message": message}
 
             # Format results
-            results = []
-            for sc in service_connections:
-                results.append(
-                    {
-                        "id": sc.id,
-                        "name": sc.name,
-                        "type": sc.type.value,
-                        "url": sc.url,
-                        "description": sc.description,
-                        "is_shared": sc.is_shared,
-                        "is_ready": sc.is_ready,
-                        "owner": sc.owner,
-                        "created_by": sc.created_by.display_name if sc.created_by else "Unknown",
-                    }
-                )
+            results = [_service_connection_summary(sc) for sc in service_connections]
 
             summary = f"Found {len(results)} service connection(s) in project '{project}'"
             if connection_type:
@@ -221,7 +323,6 @@ class ServiceConnectionService:
 
             secure_logger.info_with_context(
                 message="Successfully retrieved service connections",
-                correlation_id=correlation_id,
                 project=project,
                 connection_count=len(results),
                 connection_type=connection_type,
@@ -229,32 +330,49 @@ class ServiceConnectionService:
 
             return {"success": True, "data": results, "message": summary}
 
-        except Exception as e:
-            secure_logger.error_with_context(
-                message="Error listing service connections",
-                error=e,
-                correlation_id=correlation_id,
-                project=project,
-                connection_type=connection_type,
-            )
-            return {"success": False, "error": str(e), "data": []}
+    async def list_service_connections_many(
+        self,
+        projects: List[str],
+        connection_type: Optional[str] = None,
+        include_shared: bool = True,
+        concurrency: int = BULK_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """List service connections in several projects concurrently, in the order given."""
+        return await _gather_bounded(
+            (
+                partial(self.list_service_connections, project, connection_type, include_shared)
+                for project in projects
+            ),
+            concurrency,
+        )
 
     async def get_service_connection_details(
         self, project: str, connection_id: str
     ) -> Dict[str, Any]:
         """Get detailed information about a specific service connection."""
-        correlation_id = create_correlation_id()
-        try:
-            # Validate project exists
-            project_obj = await self.client.get_project(project)
-            if not project_obj:
-                return {"success": False, "error": f"Project '{project}' not found"}
+        with bind_correlation_id():
+            try:
+                sc = await _fetch_in_project(
+                    self.client,
+                    project,
+                    lambda project_ref: self.client.get_service_connection(
+                        project=project_ref, connection_id=connection_id
+                    ),
+                )
+            except Exception as e:
+                _forget_project_on_not_found(self.client, project, e)
+                secure_logger.error_with_context(
+                    message="Error getting service connection details",
+                    error=e,
+                    project=project,
+                    connection_id=connection_id,
+                )
+                return {"success": False, "error": str(e)}
 
-            # Get service connection
-            sc = await self.client.get_service_connection(
-                project=project_obj.id, connection_id=connection_id
-            )
+            if sc is PROJECT_NOT_FOUND:
+                return {"success": False, "error": f"Project '{project}' not found"}
             if not sc:
+                _forget_project_on_not_found(self.client, project)
                 return {
                     "success": False,
                     "error": f"Service connection with ID {connection_id} not found",
@@ -264,7 +382,6 @@ class ServiceConnectionService:
             secure_logger.security_event(
                 event_type="SERVICE_CONNECTION_ACCESS",
                 description=f"Service connection details accessed: {sc.name}",
-                correlation_id=correlation_id,
                 project=project,
                 connection_id=connection_id,
                 connection_name=sc.name,
@@ -281,30 +398,26 @@ class ServiceConnectionService:
                 "is_shared": sc.is_shared,
                 "is_ready": sc.is_ready,
                 "owner": sc.owner,
-                "created_by": {
-                    "id": sc.created_by.id,
-                    "display_name": sc.created_by.display_name,
-                    "unique_name": sc.created_by.unique_name,
-                }
-                if sc.created_by
-                else None,
+                "created_by": (
+                    {
+                        "id": sc.created_by.id,
+                        "display_name": sc.created_by.display_name,
+                        "unique_name": sc.created_by.unique_name,
+                    }
+                    if sc.created_by
+                    else None
+                ),
                 "project_id": sc.project_id,
                 "project_name": sc.project_name or project,
                 "authorization": {
                     "scheme": sc.authorization.scheme,
                     "parameters": {
-                        key: "[REDACTED]"
-                        if "password" in key.lower()
-                        or "secret" in key.lower()
-                        or "key" in key.lower()
-                        else value
+                        key: SecurityFilter.REDACTED if _is_secret_key(key) else value
                         for key, value in sc.authorization.parameters.items()
                     },
                 },
                 "data": {
-                    key: "[REDACTED]"
-                    if "password" in key.lower() or "secret" in key.lower() or "key" in key.lower()
-                    else value
+                    key: SecurityFilter.REDACTED if _is_secret_key(key) else value
                     for key, value in sc.data.items()
                 },
             }
@@ -314,13 +427,3 @@ class ServiceConnectionService:
                 "data": result,
                 "message": f"Service connection '{sc.name}' details",
             }
-
-        except Exception as e:
-            secure_logger.error_with_context(
-                message="Error getting service connection details",
-                error=e,
-                correlation_id=correlation_id,
-                project=project,
-                connection_id=connection_id,
-            )
-            return {"success": False, "error": str(e)}
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+class MockAPI:
+    """Fake Azure DevOps endpoint for httpx.MockTransport.
+
+    Requests are answered by the handler registered for their URL path and recorded
+    in order, so tests exercise the client's real request pipeline.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Handler] = {}
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.routes[request.url.path](request)
+
+    def respond(self, path: str, *responses: httpx.Response) -> None:
+        """Answer requests to path with the given responses, one per request."""
+        pending = iter(responses)
+        self.routes[path] = lambda request: next(pending)
+
+    def serve_json(self, path: str, payload: Any, status_code: int = 200) -> None:
+        """Answer every request to path with the same JSON payload."""
+        self.routes[path] = lambda request: httpx.Response(status_code, json=payload)
+
+
+def _identity(name: str) -> Dict[str, Any]:
+    return {"id": name, "displayName": name.title(), "uniqueName": f"{name}@example.com"}
+
+
+@pytest.fixture
+def mock_api() -> MockAPI:
+    """Create a fake Azure DevOps endpoint."""
+    return MockAPI()
+
+
+@pytest.fixture
+def transport(mock_api: MockAPI) -> httpx.MockTransport:
+    """Create an httpx transport that routes requests to mock_api."""
+    return httpx.MockTransport(mock_api)
+
+
+@pytest.fixture
+def project_payload() -> Dict[str, Any]:
+    """Azure DevOps project as returned by the projects API."""
+    return {
+        "id": "6ce954b1-ce1f-45d1-b94d-e6bf2464ba2c",
+        "name": "proj",
+        "url": "https://dev.azure.com/test-org/_apis/projects/proj",
+        "state": "wellFormed",
+        "visibility": "private",
+        "lastUpdateTime": "2023-01-01T00:00:00Z",
+    }
+
+
+@pytest.fixture
+def variable_group_payload() -> Dict[str, Any]:
+    """Variable group as returned by the distributed task API."""
+    return {
+        "id": 1,
+        "name": "vg",
+        "type": "Vsts",
+        "variables": {
+            "plain": {"value": "visible"},
+            "hidden": {"value": None, "isSecret": True},
+        },
+        "createdBy": _identity("alice"),
+        "createdOn": "2023-01-01T12:00:00Z",
+        "modifiedBy": _identity("bob"),
+        "modifiedOn": "2023-01-02T12:00:00Z",
+    }
+
+
+@pytest.fixture
+def service_connection_payload() -> Dict[str, Any]:
+    """Service connection as returned by the service endpoint API."""
+    return {
+        "id": "conn1",
+        "name": "Azure",
+        "type": "azurerm",
+        "url": "https://management.azure.com/",
+        "authorization": {
+            "scheme": "ServicePrincipal",
+            "parameters": {"tenantid": "tenant", "serviceprincipalkey": "hunter2"},
+        },
+        "data": {"subscriptionName": "sub"},
+        "isReady": True,
+        "createdBy": _identity("alice"),
+    }
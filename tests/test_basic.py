@@ -2,22 +2,27 @@
 Basic tests to verify the project is working.
 """
 
+import importlib
 
-def test_import_modules():
-    """Test that all modules can be imported successfully."""
-    try:
-        import pytest
+import pytest
 
-        from mcp_ado_server import client, models, services
-        from mcp_ado_server.client import AzureDevOpsClient
-        from mcp_ado_server.config import Config
-        from mcp_ado_server.models import ServiceConnection, VariableGroup
-        from mcp_ado_server.server import MCPAzureDevOpsServer
-        from mcp_ado_server.services import ServiceConnectionService, VariableGroupService
+# Module -> public names it must expose
+_MODULE_EXPORTS = {
+    "mcp_ado_server.client": ("AzureDevOpsClient",),
+    "mcp_ado_server.config": ("Config",),
+    "mcp_ado_server.models": ("ServiceConnection", "VariableGroup"),
+    "mcp_ado_server.server": ("MCPAzureDevOpsServer",),
+    "mcp_ado_server.services": ("ServiceConnectionService", "VariableGroupService"),
+}
 
-        assert True
-    except ImportError as e:
-        assert False, f"Failed to import modules: {e}"
+
+@pytest.mark.parametrize("module_name", sorted(_MODULE_EXPORTS))
+def test_import_modules(module_name):
+    """Test that each module imports and exposes its public names."""
+    module = importlib.import_module(module_name)
+
+    for name in _MODULE_EXPORTS[module_name]:
+        assert hasattr(module, name), f"{module_name} is missing {name}"
 
 
 def test_config_creation():
@@ -46,3 +51,53 @@ def test_basic_functionality():
     assert error_result.is_error is True
     assert len(error_result.content) == 2
     assert "Error: Something went wrong" in error_result.content[0]["text"]
+
+
+def test_lazy_package_exports():
+    """Test that package-level exports resolve lazily to the real objects."""
+    import mcp_ado_server
+    from mcp_ado_server.config import Config
+    from mcp_ado_server.server import MCPAzureDevOpsServer
+
+    assert mcp_ado_server.Config is Config
+    assert mcp_ado_server.MCPAzureDevOpsServer is MCPAzureDevOpsServer
+
+    with pytest.raises(AttributeError):
+        mcp_ado_server.does_not_exist
+
+
+def test_json_log_formatter_escapes_messages():
+    """Test that JSON log output stays valid when messages contain quotes."""
+    import json
+    import logging
+
+    from mcp_ado_server.main import _json_formatter
+
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, 'said "%s"', ("hi",), None)
+    output = json.loads(_json_formatter().format(record))
+
+    assert output["message"] == 'said "hi"'
+    assert output["level"] == "info"
+    assert output["logger"] == "test"
+
+
+def test_cli_parser_normalizes_choices():
+    """Test that CLI choices are accepted case-insensitively."""
+    from mcp_ado_server.main import build_parser
+
+    args = build_parser().parse_args(["--log-level", "debug", "--log-format", "TEXT"])
+    assert args.log_level == "DEBUG"
+    assert args.log_format == "text"
+    assert args.config is None
+
+
+def test_main_import_defers_server_stack():
+    """Test that importing the CLI module does not load the MCP SDK or httpx."""
+    import subprocess
+    import sys
+
+    code = "import sys, mcp_ado_server.main; print('mcp' in sys.modules or 'httpx' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
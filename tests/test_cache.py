@@ -0,0 +1,232 @@
+"""
+Tests for the in-process cache module.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from mcp_ado_server.cache import TTLCache
+from mcp_ado_server.client import AzureDevOpsClient
+from mcp_ado_server.config import Config
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_loader(self):
+        """Test that fresh entries are served without calling the loader again."""
+        cache = TTLCache(ttl=60)
+        loader = AsyncMock(return_value={"value": 1})
+
+        assert await cache.fetch("key", loader) == {"value": 1}
+        assert await cache.fetch("key", loader) == {"value": 1}
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_hit_refreshes_in_background(self):
+        """Test that stale entries are returned immediately and refreshed."""
+        cache = TTLCache(ttl=60)
+        await cache.fetch("key", AsyncMock(return_value="old"))
+        cache._entries["key"].fresh_until = 0
+
+        loader = AsyncMock(return_value="new")
+        assert await cache.fetch("key", loader) == "old"
+
+        await asyncio.gather(*cache._refreshes.values())
+        loader.assert_awaited_once()
+        assert await cache.fetch("key", loader) == "new"
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        """Test that a failing background refresh does not drop the entry."""
+        cache = TTLCache(ttl=60)
+        await cache.fetch("key", AsyncMock(return_value="old"))
+        cache._entries["key"].fresh_until = 0
+
+        assert await cache.fetch("key", AsyncMock(side_effect=RuntimeError("boom"))) == "old"
+        await asyncio.gather(*cache._refreshes.values())
+        assert cache._entries["key"].value == "old"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        """Test that entries past the stale window are loaded synchronously."""
+        cache = TTLCache(ttl=60)
+        await cache.fetch("key", AsyncMock(return_value="old"))
+        cache._entries["key"].fresh_until = 0
+        cache._entries["key"].stale_until = 0
+
+        assert await cache.fetch("key", AsyncMock(return_value="new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that concurrent misses for the same key call the loader once."""
+        cache = TTLCache(ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return calls
+
+        results = await asyncio.gather(*(cache.fetch("key", loader) for _ in range(5)))
+
+        assert results == [1, 1, 1, 1, 1]
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_prefix(self):
+        """Test dropping entries by key prefix."""
+        cache = TTLCache(ttl=60)
+        for key in ("a/1", "a/2", "b/1"):
+            await cache.fetch(key, AsyncMock(return_value=key))
+
+        assert cache.invalidate("a/") == 2
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cancels_stale_refresh(self):
+        """Test that a refresh started before invalidate cannot restore the old value."""
+        cache = TTLCache(ttl=60)
+        await cache.fetch("a/1", AsyncMock(return_value="old"))
+        cache._entries["a/1"].fresh_until = 0
+
+        release = asyncio.Event()
+
+        async def slow_reload():
+            await release.wait()
+            return "pre-invalidation"
+
+        assert await cache.fetch("a/1", slow_reload) == "old"
+        refresh = cache._refreshes["a/1"]
+        await asyncio.sleep(0)
+
+        assert cache.invalidate("a/") == 1
+        release.set()
+        await asyncio.gather(refresh, return_exceptions=True)
+
+        assert refresh.cancelled()
+        assert cache._refreshes == {}
+        assert await cache.fetch("a/1", AsyncMock(return_value="new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_load_discards_result(self):
+        """Test that a load running when its key is invalidated is not cached."""
+        cache = TTLCache(ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await release.wait()
+            return "pre-invalidation"
+
+        load = asyncio.create_task(cache.fetch("a/1", slow_load))
+        await started.wait()
+        cache.invalidate("a/")
+        release.set()
+
+        # The caller that started the load still gets its result
+        assert await load == "pre-invalidation"
+        assert "a/1" not in cache._entries
+        assert cache._locks == {}
+        assert cache._generations == {}
+        assert await cache.fetch("a/1", AsyncMock(return_value="new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_failed_loads_leave_no_bookkeeping(self):
+        """Test that keys whose loader raises do not accumulate locks."""
+        cache = TTLCache(ttl=60)
+
+        for key in ("bad/1", "bad/2"):
+            with pytest.raises(ValueError):
+                await cache.fetch(key, AsyncMock(side_effect=ValueError("boom")))
+
+        assert len(cache) == 0
+        assert cache._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_maxsize_evicts_oldest(self):
+        """Test that the oldest entry is evicted once maxsize is exceeded."""
+        cache = TTLCache(ttl=60, maxsize=2)
+        for key in ("a", "b", "c"):
+            await cache.fetch(key, AsyncMock(return_value=key))
+
+        assert list(cache._entries) == ["b", "c"]
+
+
+class TestClientCaching:
+    """Test cases for GET caching in AzureDevOpsClient."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_hits_network_once(self, mock_api, transport):
+        """Test that identical GET requests are served from the cache."""
+        client = AzureDevOpsClient(
+            Config(organization="test-org", personal_access_token="test-pat"),
+            transport=transport,
+        )
+        mock_api.routes["/api"] = lambda request: httpx.Response(200, content=b'{"value": []}')
+
+        await client._make_request("GET", "https://test.com/api", params={"a": "1"})
+        await client._make_request("GET", "https://test.com/api", params={"a": "1"})
+        await client._make_request("GET", "https://test.com/api", params={"a": "2"})
+
+        assert [dict(request.url.params)["a"] for request in mock_api.requests] == ["1", "2"]
+
+    def test_caching_disabled(self):
+        """Test that no cache is created when caching is disabled."""
+        config = Config(organization="test-org", personal_access_token="test-pat")
+        config.enable_caching = False
+
+        assert AzureDevOpsClient(config)._cache is None
+
+    @pytest.mark.asyncio
+    async def test_variable_group_details_cached_until_invalidated(self, mock_api, transport):
+        """Test that repeated detail lookups are cached and invalidate_variable_group drops them."""
+        client = AzureDevOpsClient(
+            Config(organization="test-org", personal_access_token="test-pat"),
+            transport=transport,
+        )
+        mock_api.routes["/test-org/proj/_apis/distributedtask/variablegroups/1"] = (
+            lambda request: httpx.Response(
+                200,
+                content=b'{"id": 1, "name": "vg", "type": "Vsts", "variables": {},'
+                b' "createdBy": {"id": "u", "displayName": "U", "uniqueName": "u@example.com"},'
+                b' "createdOn": "2023-01-01T00:00:00Z",'
+                b' "modifiedBy": {"id": "u", "displayName": "U", "uniqueName": "u@example.com"},'
+                b' "modifiedOn": "2023-01-01T00:00:00Z"}',
+            )
+        )
+
+        await client.get_variable_group("proj", 1)
+        await client.get_variable_group("proj", 1)
+        assert len(mock_api.requests) == 1
+
+        assert client.invalidate_variable_group("proj", 1) == 1
+        await client.get_variable_group("proj", 1)
+        assert len(mock_api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_project_drops_only_that_project(self, mock_api, transport):
+        """Test that invalidate_project leaves similarly named projects cached."""
+        client = AzureDevOpsClient(
+            Config(organization="test-org", personal_access_token="test-pat"),
+            transport=transport,
+        )
+        project = httpx.Response(
+            200,
+            content=b'{"id": "p1", "name": "proj", "url": "u", "state": "wellFormed",'
+            b' "visibility": "private", "lastUpdateTime": "2023-01-01T00:00:00Z"}',
+        )
+        for name in ("proj", "proj2"):
+            mock_api.respond(f"/test-org/_apis/projects/{name}", project)
+
+        await client.get_project("proj")
+        await client.get_project("proj2")
+
+        assert client.invalidate_project("proj") == 1
+        assert len(client._cache) == 1
@@ -2,7 +2,8 @@
 Tests for the Azure DevOps client module.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
@@ -10,6 +11,9 @@ import pytest
 from mcp_ado_server.client import AzureDevOpsAPIError, AzureDevOpsClient
 from mcp_ado_server.config import Config
 
+# "Basic " + base64(":test-pat"), spelled out so the test does not re-derive it
+_EXPECTED_AUTH = "Basic OnRlc3QtcGF0"
+
 
 @pytest.fixture
 def config():
@@ -18,9 +22,9 @@ def config():
 
 
 @pytest.fixture
-def client(config):
-    """Create a test client."""
-    return AzureDevOpsClient(config)
+def client(config, transport):
+    """Create a test client whose requests go to the mock_api fixture."""
+    return AzureDevOpsClient(config, transport=transport)
 
 
 class TestAzureDevOpsClient:
@@ -28,10 +32,7 @@ class TestAzureDevOpsClient:
 
     def test_create_auth_header(self, client):
         """Test creating authorization header."""
-        auth_header = client._create_auth_header()
-        # The header should be "Basic " + base64(":test-pat")
-        assert auth_header.startswith("Basic ")
-        assert len(auth_header) > 6  # "Basic " + encoded content
+        assert client._create_auth_header() == _EXPECTED_AUTH
 
     @pytest.mark.asyncio
     async def test_context_manager(self, client):
@@ -43,52 +44,48 @@ class TestAzureDevOpsClient:
         assert c._client is None or c._client.is_closed
 
     @pytest.mark.asyncio
-    async def test_make_request_success(self, client):
+    async def test_make_request_success(self, client, mock_api):
         """Test successful API request."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"value": [{"id": 1, "name": "test"}]}
-
-        with patch.object(client, "_client") as mock_client:
-            mock_client.request = AsyncMock(return_value=mock_response)
+        mock_api.respond(
+            "/api", httpx.Response(200, content=b'{"value": [{"id": 1, "name": "test"}]}')
+        )
 
-            result = await client._make_request("GET", "https://test.com/api")
+        result = await client._make_request("GET", "https://test.com/api")
 
-            assert result == {"value": [{"id": 1, "name": "test"}]}
-            mock_client.request.assert_called_once_with(
-                method="GET", url="https://test.com/api", params={"api-version": "7.0"}, json=None
-            )
+        assert result == {"value": [{"id": 1, "name": "test"}]}
+        [request] = mock_api.requests
+        assert request.method == "GET"
+        assert request.url == "https://test.com/api?api-version=7.0"
+        assert request.content == b""
+        assert request.headers["Authorization"] == _EXPECTED_AUTH
 
     @pytest.mark.asyncio
-    async def test_make_request_api_error(self, client):
+    async def test_make_request_api_error(self, client, mock_api):
         """Test API request with error response."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-        mock_response.json.return_value = {"message": "Resource not found"}
+        mock_api.respond("/api", httpx.Response(404, content=b'{"message": "Not Found"}'))
 
-        with patch.object(client, "_client") as mock_client:
-            mock_client.request = AsyncMock(return_value=mock_response)
-
-            with pytest.raises(AzureDevOpsAPIError) as exc_info:
-                await client._make_request("GET", "https://test.com/api")
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await client._make_request("GET", "https://test.com/api")
 
-            assert exc_info.value.status_code == 404
-            assert "Not Found" in str(exc_info.value)
+        assert exc_info.value.status_code == 404
+        assert "Not Found" in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_make_request_network_error(self, client):
+    async def test_make_request_network_error(self, client, mock_api):
         """Test API request with network error."""
-        with patch.object(client, "_client") as mock_client:
-            mock_client.request = AsyncMock(side_effect=httpx.RequestError("Network error"))
 
-            with pytest.raises(AzureDevOpsAPIError) as exc_info:
-                await client._make_request("GET", "https://test.com/api")
+        def fail(request):
+            raise httpx.RequestError("Network error", request=request)
+
+        mock_api.routes["/api"] = fail
 
-            assert "Request failed" in str(exc_info.value)
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await client._make_request("GET", "https://test.com/api")
+
+        assert "Request failed" in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_get_projects_success(self, client):
+    async def test_get_projects_success(self, client, mock_api):
         """Test successful project retrieval."""
         mock_response = {
             "value": [
@@ -104,15 +101,16 @@ class TestAzureDevOpsClient:
             ]
         }
 
-        with patch.object(client, "_make_request", return_value=mock_response):
-            projects = await client.get_projects()
+        mock_api.serve_json("/test-org/_apis/projects", mock_response)
 
-            assert len(projects) == 1
-            assert projects[0].name == "Test Project"
-            assert projects[0].id == "proj1"
+        projects = await client.get_projects()
+
+        assert len(projects) == 1
+        assert projects[0].name == "Test Project"
+        assert projects[0].id == "proj1"
 
     @pytest.mark.asyncio
-    async def test_get_project_success(self, client):
+    async def test_get_project_success(self, client, mock_api):
         """Test successful single project retrieval."""
         mock_response = {
             "id": "proj1",
@@ -124,25 +122,25 @@ class TestAzureDevOpsClient:
             "lastUpdateTime": "2023-01-01T12:00:00Z",
         }
 
-        with patch.object(client, "_make_request", return_value=mock_response):
-            project = await client.get_project("proj1")
+        mock_api.serve_json("/test-org/_apis/projects/proj1", mock_response)
+
+        project = await client.get_project("proj1")
 
-            assert project is not None
-            assert project.name == "Test Project"
-            assert project.id == "proj1"
+        assert project is not None
+        assert project.name == "Test Project"
+        assert project.id == "proj1"
 
     @pytest.mark.asyncio
-    async def test_get_project_not_found(self, client):
+    async def test_get_project_not_found(self, client, mock_api):
         """Test project retrieval when project doesn't exist."""
-        error = AzureDevOpsAPIError("Not found", status_code=404)
+        mock_api.serve_json("/test-org/_apis/projects/nonexistent", {}, status_code=404)
 
-        with patch.object(client, "_make_request", side_effect=error):
-            project = await client.get_project("nonexistent")
+        project = await client.get_project("nonexistent")
 
-            assert project is None
+        assert project is None
 
     @pytest.mark.asyncio
-    async def test_get_variable_groups_success(self, client):
+    async def test_get_variable_groups_success(self, client, mock_api):
         """Test successful variable groups retrieval."""
         mock_response = {
             "value": [
@@ -170,15 +168,16 @@ class TestAzureDevOpsClient:
             ]
         }
 
-        with patch.object(client, "_make_request", return_value=mock_response):
-            vgs = await client.get_variable_groups("proj1")
+        mock_api.serve_json("/test-org/proj1/_apis/distributedtask/variablegroups", mock_response)
+
+        vgs = await client.get_variable_groups("proj1")
 
-            assert len(vgs) == 1
-            assert vgs[0].name == "Test Variable Group"
-            assert vgs[0].id == 1
+        assert len(vgs) == 1
+        assert vgs[0].name == "Test Variable Group"
+        assert vgs[0].id == 1
 
     @pytest.mark.asyncio
-    async def test_get_service_connections_success(self, client):
+    async def test_get_service_connections_success(self, client, mock_api):
         """Test successful service connections retrieval."""
         mock_response = {
             "value": [
@@ -203,27 +202,218 @@ class TestAzureDevOpsClient:
             ]
         }
 
-        with patch.object(client, "_make_request", return_value=mock_response):
-            scs = await client.get_service_connections("proj1")
+        mock_api.serve_json("/test-org/proj1/_apis/serviceendpoint/endpoints", mock_response)
 
-            assert len(scs) == 1
-            assert scs[0].name == "Test Service Connection"
-            assert scs[0].id == "conn1"
+        scs = await client.get_service_connections("proj1")
+
+        assert len(scs) == 1
+        assert scs[0].name == "Test Service Connection"
+        assert scs[0].id == "conn1"
 
     @pytest.mark.asyncio
-    async def test_test_connection_success(self, client):
+    async def test_test_connection_success(self, client, mock_api):
         """Test successful connection test."""
-        mock_projects = [MagicMock(name="Test Project")]
+        mock_api.serve_json("/test-org/_apis/projects", {"count": 1, "value": [{}]})
 
-        with patch.object(client, "get_projects", return_value=mock_projects):
-            result = await client.test_connection()
+        assert await client.test_connection() is True
+        assert await client.test_connection() is True
 
-            assert result is True
+        # Each probe reaches the API rather than the cache
+        assert len(mock_api.requests) == 2
+        assert mock_api.requests[0].url.params["$top"] == "1"
 
     @pytest.mark.asyncio
-    async def test_test_connection_failure(self, client):
+    async def test_test_connection_failure(self, client, mock_api):
         """Test failed connection test."""
-        with patch.object(client, "get_projects", side_effect=Exception("Connection failed")):
-            result = await client.test_connection()
+        mock_api.serve_json("/test-org/_apis/projects", {"message": "Unauthorized"}, 401)
+
+        result = await client.test_connection()
+
+        assert result is False
+
+    @pytest.mark.asyncio
+    async def test_get_many_maps_not_found_to_none(self, client, mock_api):
+        """Test that bulk fetches keep order and map 404 responses to None."""
+        mock_api.serve_json("/a", {"url": "https://x/a"})
+        mock_api.serve_json("/missing", {"message": "Not Found"}, status_code=404)
+        mock_api.serve_json("/b", {"url": "https://x/b"})
+
+        results = await client._get_many(["https://x/a", "https://x/missing", "https://x/b"])
+
+        assert results == [{"url": "https://x/a"}, None, {"url": "https://x/b"}]
+
+    @pytest.mark.asyncio
+    async def test_get_many_reraises_other_errors(self, client, mock_api):
+        """Test that bulk fetches re-raise errors other than 404."""
+        mock_api.serve_json("/a", {"message": "Forbidden"}, status_code=403)
+
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await client._get_many(["https://x/a"])
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_make_request_retries_transient_status(self, client, mock_api):
+        """Test that 503 responses are retried before succeeding."""
+        mock_api.respond(
+            "/api",
+            httpx.Response(503, headers={"Retry-After": "1"}),
+            httpx.Response(200, content=b'{"value": []}'),
+        )
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await client._make_request("GET", "https://test.com/api")
+
+        assert result == {"value": []}
+        assert len(mock_api.requests) == 2
+        assert mock_sleep.await_args.args[0] >= 1
+
+    @pytest.mark.asyncio
+    async def test_make_request_gives_up_after_max_retries(self, client, mock_api):
+        """Test that transport errors are retried at most max_retries times."""
+
+        def refuse(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        mock_api.routes["/api"] = refuse
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(AzureDevOpsAPIError):
+                await client._make_request("GET", "https://test.com/api")
+
+        assert len(mock_api.requests) == client.config.max_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_replayed_after_dropped_connection(self, client, mock_api):
+        """Test that a write that may have reached the server is not retried."""
+
+        def drop(request):
+            raise httpx.ReadError("Connection reset", request=request)
+
+        mock_api.routes["/api"] = drop
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(AzureDevOpsAPIError):
+                await client._make_request("POST", "https://test.com/api", json_data={"a": 1})
+
+        assert len(mock_api.requests) == 1
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_on_gateway_error(self, client, mock_api):
+        """Test that POST is not retried on a 5xx, which may follow a processed write."""
+        mock_api.respond("/api", httpx.Response(503), httpx.Response(200, content=b"{}"))
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(AzureDevOpsAPIError) as exc_info:
+                await client._make_request("POST", "https://test.com/api", json_data={})
+
+        assert exc_info.value.status_code == 503
+        assert len(mock_api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_is_retried_when_throttled(self, client, mock_api):
+        """Test that POST is retried on 429, which Azure DevOps sends before processing."""
+        mock_api.respond("/api", httpx.Response(429), httpx.Response(200, content=b"{}"))
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock):
+            assert await client._make_request("POST", "https://test.com/api", json_data={}) == {}
+
+        assert len(mock_api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_retries_failed_connect(self, client, mock_api):
+        """Test that POST is retried when the connection was never established."""
+        responses = iter([None, httpx.Response(200, content=b"{}")])
+
+        def connect_once(request):
+            response = next(responses)
+            if response is None:
+                raise httpx.ConnectError("Connection refused", request=request)
+            return response
+
+        mock_api.routes["/api"] = connect_once
+
+        with patch("mcp_ado_server.client.asyncio.sleep", new_callable=AsyncMock):
+            assert await client._make_request("POST", "https://test.com/api", json_data={}) == {}
+
+        assert len(mock_api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_large_list_is_parsed_in_thread(self, client, mock_api):
+        """Test that large list responses are turned into models off the event loop."""
+        project = {
+            "id": "proj1",
+            "name": "Test Project",
+            "url": "https://dev.azure.com/test-org/_apis/projects/proj1",
+            "state": "wellFormed",
+            "visibility": "private",
+            "lastUpdateTime": "2023-01-01T12:00:00Z",
+        }
+        mock_api.serve_json("/test-org/_apis/projects", {"value": [project] * 100})
+
+        with patch("mcp_ado_server.client.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            projects = await client.get_projects()
+
+        assert len(projects) == 100
+        to_thread.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_make_request_does_not_mutate_params(self, client, mock_api):
+        """Test that api-version is merged without touching the caller's params."""
+        mock_api.respond("/api", httpx.Response(200, content=b"{}"))
+        params = {"groupName": "test"}
+
+        await client._make_request("GET", "https://test.com/api", params=params)
+
+        assert params == {"groupName": "test"}
+        assert dict(mock_api.requests[0].url.params) == {
+            "api-version": "7.0",
+            "groupName": "test",
+        }
+
+    @pytest.mark.asyncio
+    async def test_make_request_rejects_oversized_response(self, client, mock_api):
+        """Test that bodies larger than max_response_bytes are refused."""
+        client.config.max_response_bytes = 16
+        mock_api.respond("/api", httpx.Response(200, content=b'{"value": "' + b"x" * 64 + b'"}'))
+
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await client._make_request("GET", "https://test.com/api")
+
+        assert "byte limit" in str(exc_info.value)
+        assert exc_info.value.status_code is None
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_follows_continuation_token(self, client, mock_api):
+        """Test that list pages are fetched until no continuation token is returned."""
+        mock_api.respond(
+            "/api",
+            httpx.Response(
+                200, json={"value": [1, 2]}, headers={"x-ms-continuationtoken": "token-1"}
+            ),
+            httpx.Response(200, json={"value": [3]}),
+        )
+
+        pages = client._iter_pages("https://test.com/api", {"$top": 2})
+        results = [page async for page in pages]
+
+        assert results == [[1, 2], [3]]
+        assert dict(mock_api.requests[1].url.params) == {
+            "api-version": "7.0",
+            "$top": "2",
+            "continuationToken": "token-1",
+        }
+
+    @pytest.mark.asyncio
+    async def test_request_logging_skipped_when_debug_disabled(self, client, mock_api):
+        """Test that request/response debug logging is not built when DEBUG is off."""
+        mock_api.respond("/api", httpx.Response(200, content=b"{}"))
+
+        with patch("mcp_ado_server.client.secure_logger") as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+
+            await client._make_request("GET", "https://test.com/api")
 
-            assert result is False
+        mock_logger.debug_request.assert_not_called()
+        mock_logger.debug_response.assert_not_called()
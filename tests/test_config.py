@@ -58,6 +58,31 @@ class TestConfig:
             assert config.cache_ttl_seconds == 600
             assert config.enable_caching is False
 
+    @pytest.mark.parametrize(
+        ("env", "missing"),
+        [
+            ({"AZURE_DEVOPS_PAT": "test-pat"}, "AZURE_DEVOPS_ORGANIZATION"),
+            ({"AZURE_DEVOPS_ORGANIZATION": "test-org"}, "AZURE_DEVOPS_PAT"),
+        ],
+    )
+    def test_from_env_with_explicit_mapping_missing_var(self, env, missing):
+        """Test that an explicit mapping is validated without consulting os.environ."""
+        with pytest.raises(ValueError, match=missing):
+            Config.from_env(env)
+
+    def test_from_env_with_explicit_mapping(self):
+        """Test creating config from a plain mapping instead of os.environ."""
+        config = Config.from_env(
+            {
+                "AZURE_DEVOPS_ORGANIZATION": "test-org",
+                "AZURE_DEVOPS_PAT": "test-pat",
+                "MAX_RETRIES": "5",
+            }
+        )
+        assert config.organization == "test-org"
+        assert config.max_retries == 5
+        assert config.api_version == "7.1"
+
     def test_base_url_property(self):
         """Test base URL property."""
         config = Config(organization="test-org", personal_access_token="test-pat")
@@ -68,41 +93,53 @@ class TestConfig:
         config = Config(organization="test-org", personal_access_token="test-pat")
         assert config.api_url == "https://dev.azure.com/test-org/_apis"
 
-    def test_validate_success(self):
-        """Test successful validation."""
+    def test_project_api_url_tracks_organization(self):
+        """Test project API URL reflects the current organization."""
         config = Config(organization="test-org", personal_access_token="test-pat")
-        config.validate()  # Should not raise
+        assert config.project_api_url("proj") == "https://dev.azure.com/test-org/proj/_apis"
 
-    def test_validate_missing_organization(self):
-        """Test validation error for missing organization."""
-        config = Config(organization="", personal_access_token="test-pat")
-        with pytest.raises(ValueError, match="Organization is required"):
-            config.validate()
+        config.organization = "other-org"
+        assert config.project_api_url("proj") == "https://dev.azure.com/other-org/proj/_apis"
 
-    def test_validate_missing_pat(self):
-        """Test validation error for missing PAT."""
-        config = Config(organization="test-org", personal_access_token="")
-        with pytest.raises(ValueError, match="Personal Access Token is required"):
-            config.validate()
+    def test_auth_header_tracks_personal_access_token(self):
+        """Test the encoded credentials reflect the current PAT."""
+        config = Config(organization="test-org", personal_access_token="test-pat")
+        assert config.auth_header == "OnRlc3QtcGF0"
 
-    def test_validate_invalid_timeout(self):
-        """Test validation error for invalid timeout."""
-        config = Config(
-            organization="test-org", personal_access_token="test-pat", request_timeout=0
-        )
-        with pytest.raises(ValueError, match="Request timeout must be positive"):
-            config.validate()
+        config.personal_access_token = "other-pat"
+        assert config.auth_header == "Om90aGVyLXBhdA=="
 
-    def test_validate_invalid_retries(self):
-        """Test validation error for invalid retries."""
-        config = Config(organization="test-org", personal_access_token="test-pat", max_retries=-1)
-        with pytest.raises(ValueError, match="Max retries must be non-negative"):
-            config.validate()
+    def test_auth_header_is_per_instance(self):
+        """Test each config encodes its own PAT and comparison ignores the cached value."""
+        config = Config(organization="test-org", personal_access_token="test-pat")
+        other = Config(organization="test-org", personal_access_token="other-pat")
+        assert config.auth_header == "OnRlc3QtcGF0"
+        assert other.auth_header == "Om90aGVyLXBhdA=="
+
+        other.personal_access_token = "test-pat"
+        assert other == config
+        assert "OnRlc3QtcGF0" not in repr(config)
+
+    def test_validate_success(self):
+        """Test successful validation."""
+        config = Config(organization="test-org", personal_access_token="test-pat")
+        config.validate()  # Should not raise
 
-    def test_validate_invalid_cache_ttl(self):
-        """Test validation error for invalid cache TTL."""
+    @pytest.mark.parametrize(
+        ("field", "value", "message"),
+        [
+            ("organization", "", "Organization is required"),
+            ("personal_access_token", "", "Personal Access Token is required"),
+            ("request_timeout", 0, "Request timeout must be positive"),
+            ("max_retries", -1, "Max retries must be non-negative"),
+            ("max_response_bytes", 0, "Max response bytes must be positive"),
+            ("cache_ttl_seconds", -1, "Cache TTL must be non-negative"),
+        ],
+    )
+    def test_validate_errors(self, field, value, message):
+        """Test validation errors for each invalid setting."""
         config = Config(
-            organization="test-org", personal_access_token="test-pat", cache_ttl_seconds=-1
+            **{"organization": "test-org", "personal_access_token": "test-pat", field: value}
         )
-        with pytest.raises(ValueError, match="Cache TTL must be non-negative"):
+        with pytest.raises(ValueError, match=message):
             config.validate()
@@ -2,71 +2,150 @@
 Integration test for FastMCP server with new service architecture.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from mcp_ado_server import fastmcp_server
 from mcp_ado_server.fastmcp_server import (
     get_service_connection,
-    get_variable_group,
     initialize_services,
-    list_service_connections,
     list_variable_groups,
+    shutdown_services,
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_config():
     """Mock configuration."""
-    mock_config = MagicMock()
-    mock_config.organization = "test-org"
-    mock_config.pat = "test-pat"
-    mock_config.base_url = "https://dev.azure.com/test-org"
-    return mock_config
+    # Only attribute reads and identity are exercised, so no call tracking is needed
+    return SimpleNamespace(
+        organization="test-org",
+        pat="test-pat",
+        base_url="https://dev.azure.com/test-org",
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_services():
-    """Mock services."""
+    """Mock services, shared by every test in this module."""
     variable_group_service = AsyncMock()
     service_connection_service = AsyncMock()
     return variable_group_service, service_connection_service
 
 
-class TestFastMCPIntegration:
-    """Test FastMCP server integration with new service architecture."""
+@pytest.fixture(autouse=True)
+def reset_mock_services(mock_services):
+    """Clear recorded calls and configured responses left by the previous test."""
+    for service in mock_services:
+        service.reset_mock(return_value=True, side_effect=True)
 
-    @pytest.mark.asyncio
-    async def test_list_variable_groups_success(self, mock_services):
-        """Test successful variable groups listing."""
-        variable_group_service, _ = mock_services
 
-        # Mock service response in new format (dictionary)
-        variable_group_service.list_variable_groups.return_value = {
+@pytest.fixture(autouse=True)
+def install_services(monkeypatch, mock_services):
+    """Make the FastMCP tools use the mock services."""
+    variable_group_service, service_connection_service = mock_services
+    monkeypatch.setattr(fastmcp_server, "variable_group_service", variable_group_service)
+    monkeypatch.setattr(fastmcp_server, "service_connection_service", service_connection_service)
+
+
+# (tool, index into mock_services, service method, tool args, service response,
+#  expected service call kwargs)
+SUCCESS_CASES = [
+    pytest.param(
+        "list_variable_groups",
+        0,
+        "list_variable_groups",
+        ("test-project",),
+        {
             "success": True,
             "data": [
                 {"id": 1, "name": "test-group-1", "variables": {}},
                 {"id": 2, "name": "test-group-2", "variables": {}},
             ],
             "message": "Successfully retrieved variable groups",
-        }
+        },
+        {"project": "test-project", "group_name": None},
+        id="list_variable_groups",
+    ),
+    pytest.param(
+        "get_variable_group",
+        0,
+        "get_variable_group_details",
+        ("test-project", 123),
+        {
+            "success": True,
+            "data": {
+                "id": 123,
+                "name": "test-group",
+                "variables": {"key1": "value1", "key2": "value2"},
+            },
+            "message": "Successfully retrieved variable group details",
+        },
+        {"project": "test-project", "group_id": 123},
+        id="get_variable_group",
+    ),
+    pytest.param(
+        "list_service_connections",
+        1,
+        "list_service_connections",
+        ("test-project",),
+        {
+            "success": True,
+            "data": [
+                {"id": "conn1", "name": "Azure Connection", "type": "AzureRM"},
+                {"id": "conn2", "name": "GitHub Connection", "type": "GitHub"},
+            ],
+            "message": "Successfully retrieved service connections",
+        },
+        {"project": "test-project", "connection_type": None, "include_shared": True},
+        id="list_service_connections",
+    ),
+    pytest.param(
+        "get_service_connection",
+        1,
+        "get_service_connection_details",
+        ("test-project", "conn123"),
+        {
+            "success": True,
+            "data": {"id": "conn123", "name": "Azure Connection", "type": "AzureRM", "ready": True},
+            "message": "Successfully retrieved service connection details",
+        },
+        {"project": "test-project", "connection_id": "conn123"},
+        id="get_service_connection",
+    ),
+]
+
 
-        # Mock the global service
-        with patch("mcp_ado_server.fastmcp_server.variable_group_service", variable_group_service):
-            result = await list_variable_groups("test-project")
+class TestFastMCPIntegration:
+    """Test FastMCP server integration with new service architecture."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("tool_name", "service_index", "method_name", "args", "response", "expected_call"),
+        SUCCESS_CASES,
+    )
+    async def test_tool_success(
+        self, mock_services, tool_name, service_index, method_name, args, response, expected_call
+    ):
+        """Test that each tool passes its arguments through and returns the service data."""
+        method = getattr(mock_services[service_index], method_name)
+        method.return_value = response
+
+        result = await getattr(fastmcp_server, tool_name)(*args)
 
-        # Verify the result format
         assert result["success"] is True
-        assert "data" in result
-        assert "message" in result
-        assert "count" in result
-        assert result["count"] == 2
-        assert len(result["data"]) == 2
+        assert result["data"] == response["data"]
+        assert result["message"] == response["message"]
+        if isinstance(response["data"], list):
+            assert result["count"] == len(response["data"])
+        else:
+            assert "count" not in result
 
-        # Verify service was called correctly
-        variable_group_service.list_variable_groups.assert_called_once_with(
-            project="test-project", group_name=None
-        )
+        method.assert_called_once_with(**expected_call)
 
     @pytest.mark.asyncio
     async def test_list_variable_groups_error(self, mock_services):
@@ -80,8 +159,7 @@ class TestFastMCPIntegration:
             "message": "Failed to fetch variable groups",
         }
 
-        with patch("mcp_ado_server.fastmcp_server.variable_group_service", variable_group_service):
-            result = await list_variable_groups("test-project")
+        result = await list_variable_groups("test-project")
 
         # Verify error response
         assert result["success"] is False
@@ -89,104 +167,96 @@ class TestFastMCPIntegration:
         assert result["error"] == "API Error"
 
     @pytest.mark.asyncio
-    async def test_get_variable_group_success(self, mock_services):
-        """Test successful variable group details retrieval."""
+    async def test_exception_handling(self, mock_services):
+        """Test exception handling in FastMCP tools."""
         variable_group_service, _ = mock_services
 
-        # Mock service response
-        variable_group_service.get_variable_group_details.return_value = {
-            "success": True,
-            "data": {
-                "id": 123,
-                "name": "test-group",
-                "variables": {"key1": "value1", "key2": "value2"},
-            },
-            "message": "Successfully retrieved variable group details",
-        }
-
-        with patch("mcp_ado_server.fastmcp_server.variable_group_service", variable_group_service):
-            result = await get_variable_group("test-project", 123)
+        # Mock service to raise an exception
+        variable_group_service.list_variable_groups.side_effect = Exception("Network error")
 
-        # Verify the result
-        assert result["success"] is True
-        assert result["data"]["id"] == 123
-        assert result["data"]["name"] == "test-group"
+        result = await list_variable_groups("test-project")
 
-        # Verify service call
-        variable_group_service.get_variable_group_details.assert_called_once_with(
-            project="test-project", group_id=123
-        )
+        # Verify error handling
+        assert result["success"] is False
+        assert "error" in result
+        assert "Network error" in result["error"]
+        assert "Failed to list variable groups" in result["message"]
 
     @pytest.mark.asyncio
-    async def test_list_service_connections_success(self, mock_services):
-        """Test successful service connections listing."""
+    async def test_exception_message_includes_arguments(self, mock_services):
+        """Test that tool error messages can reference the tool arguments."""
         _, service_connection_service = mock_services
+        service_connection_service.get_service_connection_details.side_effect = Exception("boom")
 
-        # Mock service response
-        service_connection_service.list_service_connections.return_value = {
-            "success": True,
-            "data": [
-                {"id": "conn1", "name": "Azure Connection", "type": "AzureRM"},
-                {"id": "conn2", "name": "GitHub Connection", "type": "GitHub"},
-            ],
-            "message": "Successfully retrieved service connections",
-        }
-
-        with patch(
-            "mcp_ado_server.fastmcp_server.service_connection_service", service_connection_service
-        ):
-            result = await list_service_connections("test-project")
-
-        # Verify result
-        assert result["success"] is True
-        assert result["count"] == 2
-        assert len(result["data"]) == 2
+        result = await get_service_connection("test-project", "conn123")
 
-        # Verify service call
-        service_connection_service.list_service_connections.assert_called_once_with(
-            project="test-project", connection_type=None, include_shared=True
-        )
+        assert result["success"] is False
+        assert result["message"] == "Failed to get service connection conn123: boom"
 
     @pytest.mark.asyncio
-    async def test_get_service_connection_success(self, mock_services):
-        """Test successful service connection details retrieval."""
+    async def test_failure_without_message_uses_default_text(self, mock_services):
+        """Test the fallback message when a failed service result carries none."""
         _, service_connection_service = mock_services
-
-        # Mock service response
         service_connection_service.get_service_connection_details.return_value = {
-            "success": True,
-            "data": {"id": "conn123", "name": "Azure Connection", "type": "AzureRM", "ready": True},
-            "message": "Successfully retrieved service connection details",
+            "success": False,
+            "error": "Not found",
         }
 
-        with patch(
-            "mcp_ado_server.fastmcp_server.service_connection_service", service_connection_service
-        ):
-            result = await get_service_connection("test-project", "conn123")
+        result = await get_service_connection("test-project", "conn123")
 
-        # Verify result
-        assert result["success"] is True
-        assert result["data"]["id"] == "conn123"
-        assert result["data"]["name"] == "Azure Connection"
+        assert result == {
+            "success": False,
+            "error": "Not found",
+            "message": "Failed to get service connection details",
+        }
+
+    @pytest.mark.asyncio
+    async def test_exception_message_fills_defaulted_arguments(self):
+        """Test that error templates may reference arguments the caller left out."""
+
+        @fastmcp_server.mcp_tool_result("list {project} ({group_name})")
+        async def tool(project: str, group_name: Optional[str] = None) -> Dict[str, Any]:
+            raise Exception("boom")
 
-        # Verify service call
-        service_connection_service.get_service_connection_details.assert_called_once_with(
-            project="test-project", connection_id="conn123"
-        )
+        result = await tool("test-project")
+
+        assert result["message"] == "Failed to list test-project (None): boom"
 
     @pytest.mark.asyncio
-    async def test_exception_handling(self, mock_services):
-        """Test exception handling in FastMCP tools."""
-        variable_group_service, _ = mock_services
+    async def test_concurrent_initialization_creates_one_client(self, mock_config):
+        """Test that concurrent first calls share a single client."""
+        mock_client = AsyncMock()
+
+        with (
+            patch("mcp_ado_server.fastmcp_server.client", None),
+            patch("mcp_ado_server.fastmcp_server.Config.from_env", return_value=mock_config),
+            patch(
+                "mcp_ado_server.fastmcp_server.AzureDevOpsClient", return_value=mock_client
+            ) as client_cls,
+        ):
+            await asyncio.gather(*(initialize_services() for _ in range(5)))
+            client_cls.assert_called_once_with(mock_config)
 
-        # Mock service to raise an exception
-        variable_group_service.list_variable_groups.side_effect = Exception("Network error")
+            await shutdown_services()
+            mock_client.close.assert_awaited_once()
 
-        with patch("mcp_ado_server.fastmcp_server.variable_group_service", variable_group_service):
-            result = await list_variable_groups("test-project")
+    @pytest.mark.asyncio
+    async def test_tool_reports_missing_service(self, monkeypatch):
+        """Test that a tool fails cleanly if the services are gone after initialization."""
+        monkeypatch.setattr(fastmcp_server, "variable_group_service", None)
+        monkeypatch.setattr(fastmcp_server, "initialize_services", AsyncMock())
+
+        result = await list_variable_groups("test-project")
 
-        # Verify error handling
         assert result["success"] is False
-        assert "error" in result
-        assert "Network error" in result["error"]
-        assert "Failed to list variable groups" in result["message"]
+        assert result["error"] == "Variable group service is not initialized"
+
+    @pytest.mark.asyncio
+    async def test_client_closed_only_when_last_session_ends(self):
+        """Test that overlapping sessions share the client until the last one exits."""
+        with patch("mcp_ado_server.fastmcp_server.shutdown_services") as shutdown:
+            async with fastmcp_server._lifespan(fastmcp_server.mcp):
+                async with fastmcp_server._lifespan(fastmcp_server.mcp):
+                    pass
+                shutdown.assert_not_awaited()
+            shutdown.assert_awaited_once()
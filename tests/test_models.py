@@ -2,6 +2,7 @@
 Tests for the models module.
 """
 
+from dataclasses import FrozenInstanceError
 from datetime import datetime
 
 import pytest
@@ -110,6 +111,16 @@ class TestServiceConnection:
         assert sc.project_id == "proj1"
         assert sc.project_name == "Test Project"
 
+    def test_from_api_response_unknown_type(self):
+        """Test that unrecognised connection types fall back to generic."""
+        sc = ServiceConnection.from_api_response(
+            {"id": "conn2", "name": "Npm Feed", "type": "externalnpmregistry"}
+        )
+
+        assert sc.type == ServiceConnectionType.GENERIC
+        assert sc.created_by is None
+        assert sc.project_id is None
+
 
 class TestProject:
     """Test cases for Project model."""
@@ -150,7 +161,20 @@ class TestMCPToolResult:
         assert result.content[0]["type"] == "text"
         assert result.content[0]["text"] == "Operation successful"
         assert result.content[1]["type"] == "text"
-        assert "{'key': 'value'}" in result.content[1]["text"]
+        assert result.content[1]["text"] == '{"key":"value"}'
+
+    def test_success_result_string_passthrough(self):
+        """Test that string data is used as-is rather than JSON-encoded."""
+        result = MCPToolResult.success("plain text")
+
+        assert result.content == [{"type": "text", "text": "plain text"}]
+
+    def test_result_is_frozen(self):
+        """Test that results cannot be reassigned once built."""
+        result = MCPToolResult.success("plain text")
+
+        with pytest.raises(FrozenInstanceError):
+            result.is_error = True
 
     def test_error_result(self):
         """Test creating an error result."""
@@ -171,7 +195,7 @@ class TestMCPToolResult:
         assert result.is_error is False
         assert len(result.content) == 1
         assert result.content[0]["type"] == "text"
-        assert "[1, 2, 3]" in result.content[0]["text"]
+        assert result.content[0]["text"] == "[1,2,3]"
 
     def test_error_result_without_details(self):
         """Test creating an error result without details."""
@@ -3,12 +3,14 @@ Tests for security functionality.
 """
 
 import logging
+from unittest.mock import patch
 
 import pytest
 
 from mcp_ado_server.security import (
     SecureLogger,
     SecurityFilter,
+    bind_correlation_id,
     create_correlation_id,
     get_secure_logger,
 )
@@ -203,6 +205,38 @@ class TestSecureLoggerIntegration:
         assert "token=[FILTERED]" in log_message
         assert "project=test" in log_message or "'project': 'test'" in log_message
 
+    def test_debug_request_skipped_when_debug_disabled(self, caplog):
+        """Test debug request logging does no work when DEBUG is disabled."""
+        logger = logging.getLogger("test_debug_disabled")
+        logger.setLevel(logging.INFO)
+        secure_logger = SecureLogger(logger)
+
+        with patch.object(SecurityFilter, "sanitize_for_logging") as mock_sanitize:
+            with caplog.at_level(logging.INFO, logger="test_debug_disabled"):
+                secure_logger.debug_request(
+                    method="GET", url="https://api.example.com/test", correlation_id="skip123"
+                )
+                secure_logger.debug_response(status_code=200, response_size=10)
+
+        mock_sanitize.assert_not_called()
+        assert not caplog.records
+
+    def test_context_logging_skipped_when_level_disabled(self, caplog):
+        """Test info and security event logging do no filtering below the logger level."""
+        logger = logging.getLogger("test_info_disabled")
+        logger.setLevel(logging.ERROR)
+        secure_logger = SecureLogger(logger)
+
+        with patch.object(SecurityFilter, "filter_sensitive_dict") as mock_filter:
+            with caplog.at_level(logging.ERROR, logger="test_info_disabled"):
+                secure_logger.info_with_context(message="Connected", project="test")
+                secure_logger.security_event(
+                    event_type="AUTHORIZATION_FAILURE", description="Denied", severity="WARNING"
+                )
+
+        mock_filter.assert_not_called()
+        assert not caplog.records
+
     def test_security_event_logging(self, caplog):
         """Test security event logging."""
         logger = logging.getLogger("test_security")
@@ -248,6 +282,40 @@ class TestSecureLoggerIntegration:
         assert "api_key=[FILTERED]" in log_message or "'api_key': '[FILTERED]'" in log_message
         assert "project=test_project" in log_message or "'project': 'test_project'" in log_message
 
+    def test_bound_correlation_id_used_by_default(self, caplog):
+        """Test that a bound correlation ID prefixes logs that do not pass one."""
+        logger = logging.getLogger("test_bound")
+        logger.setLevel(logging.INFO)
+        secure_logger = SecureLogger(logger)
+
+        with caplog.at_level(logging.INFO):
+            with bind_correlation_id() as correlation_id:
+                secure_logger.info_with_context("Implicit")
+                secure_logger.info_with_context("Explicit", correlation_id="own123")
+            secure_logger.info_with_context("Unbound")
+
+        assert [record.message for record in caplog.records] == [
+            f"[{correlation_id}] Implicit",
+            "[own123] Explicit",
+            "Unbound",
+        ]
+
+    def test_bind_correlation_id_restores_previous_id(self, caplog):
+        """Test that leaving a nested binding restores the outer correlation ID."""
+        secure_logger = SecureLogger(logging.getLogger("test.secure.nested"))
+
+        with caplog.at_level(logging.INFO):
+            with bind_correlation_id() as outer:
+                with bind_correlation_id() as inner:
+                    secure_logger.info_with_context("Inner")
+                secure_logger.info_with_context("Outer")
+
+        assert inner != outer
+        assert [record.message for record in caplog.records] == [
+            f"[{inner}] Inner",
+            f"[{outer}] Outer",
+        ]
+
 
 class TestEdgeCases:
     """Test edge cases and error conditions."""
@@ -261,6 +329,19 @@ class TestEdgeCases:
         assert filtered["password"] == "[FILTERED]"  # Still filtered even if None
         assert filtered["key3"] == "value"
 
+    def test_filter_clean_dict_returns_original(self):
+        """Test that dictionaries with nothing sensitive are returned without copying."""
+        data = {"name": "test", "nested": {"count": 1}, "items": [{"id": 2}, "plain"]}
+        assert SecurityFilter.filter_sensitive_dict(data) is data
+
+    def test_filter_keeps_lists_without_dicts(self):
+        """Test that lists with no dictionaries are reused rather than copied."""
+        data = {"password": "secret", "tags": ["a", "b"]}
+        filtered = SecurityFilter.filter_sensitive_dict(data)
+
+        assert filtered["password"] == "[FILTERED]"
+        assert filtered["tags"] is data["tags"]
+
     def test_filter_empty_dict(self):
         """Test filtering empty dictionary."""
         filtered = SecurityFilter.filter_sensitive_dict({})
@@ -0,0 +1,93 @@
+"""
+Tests for the low-level MCP server module.
+"""
+
+from functools import partial
+
+import orjson
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from mcp_ado_server import server as server_module
+from mcp_ado_server.client import AzureDevOpsClient
+from mcp_ado_server.config import Config
+
+VG_LIST_PATH = "/test-org/proj/_apis/distributedtask/variablegroups"
+PROJECT_PATH = "/test-org/_apis/projects/proj"
+
+
+@pytest.fixture
+async def server(monkeypatch, transport):
+    """Create an initialized server whose client talks to the mock_api fixture."""
+    monkeypatch.setattr(
+        server_module, "AzureDevOpsClient", partial(AzureDevOpsClient, transport=transport)
+    )
+    mcp_server = server_module.MCPAzureDevOpsServer(
+        Config(organization="test-org", personal_access_token="test-pat")
+    )
+    await mcp_server.initialize()
+    yield mcp_server
+    await mcp_server.client.close()
+
+
+def call(name, **arguments):
+    """Build a tools/call request."""
+    return CallToolRequest(params=CallToolRequestParams(name=name, arguments=arguments))
+
+
+class TestCallTool:
+    """Test cases for MCPAzureDevOpsServer._call_tool."""
+
+    @pytest.mark.asyncio
+    async def test_successful_call_returns_message_and_json_data(
+        self, server, mock_api, project_payload, variable_group_payload
+    ):
+        """Test that a service result becomes a message plus one JSON document."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 1, "value": [variable_group_payload]})
+
+        result = await server._call_tool(call("list_variable_groups", project="proj"))
+
+        assert result.isError is False
+        message, document = result.content
+        assert message.text == "Found 1 variable group(s) in project 'proj'"
+        [group] = orjson.loads(document.text)
+        assert group["id"] == 1
+        assert group["name"] == "vg"
+        assert group["created_on"] == "2023-01-01T12:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool(self, server, mock_api):
+        """Test that unknown tool names are reported as errors without any request."""
+        result = await server._call_tool(call("delete_everything"))
+
+        assert result.isError is True
+        assert result.content[0].text == "Unknown tool: delete_everything"
+        assert mock_api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_failing_tool_reports_service_error(self, server, mock_api, project_payload):
+        """Test that a failed service call is returned as an MCP error result."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(f"{VG_LIST_PATH}/7", {"message": "Access denied"}, status_code=403)
+
+        result = await server._call_tool(
+            call("get_variable_group_details", project="proj", group_id=7)
+        )
+
+        assert result.isError is True
+        [content] = result.content
+        assert content.text.startswith("Error: ")
+        assert "Access denied" in content.text
+
+    @pytest.mark.asyncio
+    async def test_call_before_initialize(self):
+        """Test that tool calls are refused until the client exists."""
+        mcp_server = server_module.MCPAzureDevOpsServer(
+            Config(organization="test-org", personal_access_token="test-pat")
+        )
+
+        result = await mcp_server._call_tool(call("list_variable_groups", project="proj"))
+
+        assert result.isError is True
+        assert "not initialized" in result.content[0].text
@@ -0,0 +1,381 @@
+"""
+Tests for the service layer module.
+"""
+
+import asyncio
+import json
+import logging
+import re
+
+import pytest
+
+from mcp_ado_server.client import AzureDevOpsAPIError, AzureDevOpsClient
+from mcp_ado_server.config import Config
+from mcp_ado_server.security import _correlation_id
+from mcp_ado_server.services import (
+    PROJECT_NOT_FOUND,
+    ServiceConnectionService,
+    VariableGroupService,
+    _fetch_in_project,
+    _gather_bounded,
+    _is_secret_key,
+)
+
+PROJECT_ID = "6ce954b1-ce1f-45d1-b94d-e6bf2464ba2c"
+PROJECT_PATH = "/test-org/_apis/projects/proj"
+VG_LIST_PATH = "/test-org/proj/_apis/distributedtask/variablegroups"
+
+
+@pytest.fixture
+def client(transport):
+    """Create a test client whose requests go to the mock_api fixture."""
+    return AzureDevOpsClient(
+        Config(organization="test-org", personal_access_token="test-pat"), transport=transport
+    )
+
+
+@pytest.fixture
+def vg_service(client):
+    """Create a variable group service on top of the test client."""
+    return VariableGroupService(client)
+
+
+def paths(mock_api):
+    """Return the URL paths requested so far, in order."""
+    return [request.url.path for request in mock_api.requests]
+
+
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        ("password", True),
+        ("servicePrincipalKey", True),
+        ("clientSecret", True),
+        ("apitoken", True),
+        ("ACCESSTOKEN", True),
+        ("credentials", True),
+        ("tenantid", False),
+        ("subscriptionName", False),
+        ("scheme", False),
+        ("", False),
+        # Substring matching errs towards redaction: these are not secrets
+        ("keyvault", True),
+        ("monkey", True),
+    ],
+)
+def test_is_secret_key(key, expected):
+    """Test which service connection field names are treated as secrets."""
+    assert _is_secret_key(key) is expected
+
+
+class TestFetchInProject:
+    """Test cases for _fetch_in_project."""
+
+    @pytest.mark.asyncio
+    async def test_returns_fetch_result_for_existing_project(
+        self, client, mock_api, project_payload
+    ):
+        """Test that the fetch result is returned once the project is known to exist."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 0, "value": []})
+
+        result = await _fetch_in_project(client, "proj", client.get_variable_groups)
+
+        assert result == []
+        assert sorted(paths(mock_api)) == [PROJECT_PATH, VG_LIST_PATH]
+
+    @pytest.mark.asyncio
+    async def test_missing_project(self, client, mock_api):
+        """Test that a missing project wins over the not-found error from the fetch."""
+        mock_api.serve_json(PROJECT_PATH, {"message": "Project not found"}, status_code=404)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Project not found"}, status_code=404)
+
+        result = await _fetch_in_project(client, "proj", client.get_variable_groups)
+
+        assert result is PROJECT_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_missing_project_wins_when_both_calls_fail(self, client, mock_api):
+        """Test that any error from the fetch is ignored once the project is known missing."""
+        mock_api.serve_json(PROJECT_PATH, {"message": "Project not found"}, status_code=404)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Access denied"}, status_code=403)
+
+        result = await _fetch_in_project(client, "proj", client.get_variable_groups)
+
+        assert result is PROJECT_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_raised_when_project_exists(self, client, mock_api, project_payload):
+        """Test that a failed fetch is raised rather than masked by the project lookup."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Access denied"}, status_code=403)
+
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await _fetch_in_project(client, "proj", client.get_variable_groups)
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_project_lookup_error_reraised(self, client, mock_api):
+        """Test that a non-404 project lookup failure is raised, not reported as missing."""
+        mock_api.serve_json(PROJECT_PATH, {"message": "Unauthorized"}, status_code=401)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 0, "value": []})
+
+        with pytest.raises(AzureDevOpsAPIError) as exc_info:
+            await _fetch_in_project(client, "proj", client.get_variable_groups)
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_project_id_skips_lookup(self, client, mock_api):
+        """Test that a project GUID goes straight to the fetch."""
+        vg_path = f"/test-org/{PROJECT_ID}/_apis/distributedtask/variablegroups"
+        mock_api.serve_json(vg_path, {"count": 0, "value": []})
+
+        result = await _fetch_in_project(client, PROJECT_ID, client.get_variable_groups)
+
+        assert result == []
+        assert paths(mock_api) == [vg_path]
+
+    @pytest.mark.asyncio
+    async def test_unknown_project_id(self, client, mock_api):
+        """Test that a not-found request under an unknown project ID reports the project."""
+        vg_path = f"/test-org/{PROJECT_ID}/_apis/distributedtask/variablegroups"
+        project_path = f"/test-org/_apis/projects/{PROJECT_ID}"
+        mock_api.serve_json(vg_path, {"message": "Not found"}, status_code=404)
+        mock_api.serve_json(f"{vg_path}/7", {"message": "Not found"}, status_code=404)
+        mock_api.serve_json(project_path, {"message": "Not found"}, status_code=404)
+
+        listed = await _fetch_in_project(client, PROJECT_ID, client.get_variable_groups)
+        detail = await _fetch_in_project(
+            client, PROJECT_ID, lambda ref: client.get_variable_group(ref, 7)
+        )
+
+        assert listed is PROJECT_NOT_FOUND
+        assert detail is PROJECT_NOT_FOUND
+        assert paths(mock_api) == [vg_path, project_path, f"{vg_path}/7", project_path]
+
+    @pytest.mark.asyncio
+    async def test_missing_item_under_project_id(self, client, mock_api, project_payload):
+        """Test that a missing item under an existing project ID stays a missing item."""
+        vg_path = f"/test-org/{PROJECT_ID}/_apis/distributedtask/variablegroups"
+        mock_api.serve_json(f"{vg_path}/7", {"message": "Not found"}, status_code=404)
+        mock_api.serve_json(f"/test-org/_apis/projects/{PROJECT_ID}", project_payload)
+
+        result = await _fetch_in_project(
+            client, PROJECT_ID, lambda ref: client.get_variable_group(ref, 7)
+        )
+
+        assert result is None
+
+
+class TestGatherBounded:
+    """Test cases for _gather_bounded."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_call_order(self):
+        """Test that results follow the order of the calls, not of completion."""
+
+        async def after(delay, value):
+            await asyncio.sleep(delay)
+            return value
+
+        calls = [lambda: after(0.02, "a"), lambda: after(0, "b"), lambda: after(0.01, "c")]
+
+        assert await _gather_bounded(calls, concurrency=3) == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bound(self):
+        """Test that no more than concurrency calls run at once."""
+        running = peak = 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        await _gather_bounded([call] * 10, concurrency=3)
+
+        assert peak == 3
+
+
+class TestVariableGroupService:
+    """Test cases for VariableGroupService."""
+
+    @pytest.mark.asyncio
+    async def test_list_missing_project(self, vg_service, mock_api):
+        """Test that a missing project is reported by name."""
+        mock_api.serve_json(PROJECT_PATH, {"message": "Project not found"}, status_code=404)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Project not found"}, status_code=404)
+
+        result = await vg_service.list_variable_groups("proj")
+
+        assert result == {"success": False, "error": "Project 'proj' not found", "data": []}
+
+    @pytest.mark.asyncio
+    async def test_results_are_json_serializable(
+        self, vg_service, mock_api, project_payload, variable_group_payload
+    ):
+        """Test that timestamps leave the service as ISO 8601 strings."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 1, "value": [variable_group_payload]})
+        mock_api.serve_json(f"{VG_LIST_PATH}/1", variable_group_payload)
+
+        listed = await vg_service.list_variable_groups("proj")
+        details = await vg_service.get_variable_group_details("proj", 1)
+
+        [group] = json.loads(json.dumps(listed["data"]))
+        assert group["created_on"] == "2023-01-01T12:00:00+00:00"
+        assert group["modified_on"] == "2023-01-02T12:00:00+00:00"
+        document = json.loads(json.dumps(details["data"]))
+        assert document["variables"] == {
+            "plain": {"value": "visible", "is_secret": False},
+            "hidden": {"value": "[SECRET]", "is_secret": True},
+        }
+        assert document["created_on"] == "2023-01-01T12:00:00+00:00"
+        assert document["modified_on"] == "2023-01-02T12:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_list_api_error(self, vg_service, mock_api, project_payload):
+        """Test that a failed request is returned as an error result."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Access denied"}, status_code=403)
+
+        result = await vg_service.list_variable_groups("proj")
+
+        assert result["success"] is False
+        assert "Access denied" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_not_found_request_forgets_cached_project(
+        self, vg_service, mock_api, project_payload
+    ):
+        """Test that a 404 under a cached project drops its lookup from the cache."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"message": "Not found"}, status_code=404)
+        await vg_service.client.get_project("proj")
+
+        result = await vg_service.list_variable_groups("proj")
+        assert result["success"] is False
+
+        await vg_service.list_variable_groups("proj")
+        # Looked up again after the 404 instead of trusting the cached project
+        assert paths(mock_api).count(PROJECT_PATH) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_group_forgets_cached_project(
+        self, vg_service, mock_api, project_payload
+    ):
+        """Test that a variable group found missing drops the cached project lookup."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(f"{VG_LIST_PATH}/7", {"message": "Not found"}, status_code=404)
+
+        result = await vg_service.get_variable_group_details("proj", 7)
+        assert result == {"success": False, "error": "Variable group with ID 7 not found"}
+
+        await vg_service.get_variable_group_details("proj", 7)
+        assert paths(mock_api).count(PROJECT_PATH) == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_keep_cached_project(self, vg_service, mock_api, project_payload):
+        """Test that errors other than 404 leave the cached project lookup alone."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(f"{VG_LIST_PATH}/7", {"message": "Access denied"}, status_code=403)
+
+        await vg_service.get_variable_group_details("proj", 7)
+        await vg_service.get_variable_group_details("proj", 7)
+
+        assert paths(mock_api).count(PROJECT_PATH) == 1
+
+    @pytest.mark.asyncio
+    async def test_each_call_binds_and_releases_a_correlation_id(
+        self, vg_service, mock_api, project_payload, caplog
+    ):
+        """Test that every call logs under its own correlation ID and unbinds it after."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 0, "value": []})
+        mock_api.serve_json(f"{VG_LIST_PATH}/7", {"message": "Denied"}, status_code=403)
+
+        with caplog.at_level(logging.INFO, logger="mcp_ado_server.services"):
+            await vg_service.get_variable_group_details("proj", 7)
+            assert _correlation_id.get() is None
+            await vg_service.get_variable_group_details("proj", 7)
+            assert _correlation_id.get() is None
+
+        ids = [
+            re.match(
+                r"\[(\w+)\] Error: Error getting variable group details", record.message
+            ).group(1)
+            for record in caplog.records
+            if record.name == "mcp_ado_server.services"
+        ]
+        assert len(ids) == 2
+        assert ids[0] != ids[1]
+
+    @pytest.mark.asyncio
+    async def test_list_many_keeps_order_and_per_project_errors(
+        self, vg_service, mock_api, project_payload, variable_group_payload
+    ):
+        """Test that each project gets its own result, in the order requested."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(VG_LIST_PATH, {"count": 1, "value": [variable_group_payload]})
+        mock_api.serve_json("/test-org/_apis/projects/gone", {"message": "Nope"}, status_code=404)
+        mock_api.serve_json(
+            "/test-org/gone/_apis/distributedtask/variablegroups", {"message": "Nope"}, 404
+        )
+
+        results = await vg_service.list_variable_groups_many(["gone", "proj"], concurrency=1)
+
+        assert [result["success"] for result in results] == [False, True]
+        assert results[0]["error"] == "Project 'gone' not found"
+        assert [group["id"] for group in results[1]["data"]] == [1]
+
+
+class TestServiceConnectionService:
+    """Test cases for ServiceConnectionService."""
+
+    @pytest.mark.asyncio
+    async def test_list_many_keeps_order_and_per_project_errors(
+        self, client, mock_api, project_payload, service_connection_payload
+    ):
+        """Test that one failing project does not fail the others."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(
+            "/test-org/proj/_apis/serviceendpoint/endpoints",
+            {"count": 1, "value": [service_connection_payload]},
+        )
+        mock_api.serve_json("/test-org/_apis/projects/locked", project_payload)
+        mock_api.serve_json(
+            "/test-org/locked/_apis/serviceendpoint/endpoints", {"message": "Denied"}, 403
+        )
+
+        results = await ServiceConnectionService(client).list_service_connections_many(
+            ["proj", "locked", "proj"]
+        )
+
+        assert [result["success"] for result in results] == [True, False, True]
+        assert "Denied" in results[1]["error"]
+        assert results[0]["data"][0]["id"] == "conn1"
+        assert results[2] == results[0]
+
+    @pytest.mark.asyncio
+    async def test_details_redact_secret_fields(
+        self, client, mock_api, project_payload, service_connection_payload
+    ):
+        """Test that secret authorization parameters are replaced by the redaction marker."""
+        mock_api.serve_json(PROJECT_PATH, project_payload)
+        mock_api.serve_json(
+            "/test-org/proj/_apis/serviceendpoint/endpoints/conn1", service_connection_payload
+        )
+
+        result = await ServiceConnectionService(client).get_service_connection_details(
+            "proj", "conn1"
+        )
+
+        assert result["data"]["authorization"]["parameters"] == {
+            "tenantid": "tenant",
+            "serviceprincipalkey": "[REDACTED]",
+        }
+        assert result["data"]["data"] == {"subscriptionName": "sub"}